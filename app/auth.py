@@ -5,16 +5,25 @@ This module provides authentication functionalities for admin and student users.
 It includes functions to verify credentials and raise appropriate HTTP exceptions
 for unauthorized access.
 
+Successful checks are remembered for a short time so that repeat requests can skip
+bcrypt; see _check_password.
+
 Environment Variables:
 - ADMIN_PASSWORD: The password for the admin user.
 - STUDENT_PASSWORD: The password for the student user.
+- TESTING_PASSWORD: The password for the testing user.
+- AUTH_CACHE_TTL: Seconds a verified credential is remembered (default 300; 0 disables).
 
 Dependencies:
 - bcrypt: Library for hashing and checking passwords.
 - fastapi: Web framework for building APIs with Python.
 """
 
+import hashlib
+import hmac
 import os
+import secrets
+import time
 from typing import NoReturn, Optional
 
 import bcrypt
@@ -34,6 +43,8 @@ stud_pw = bcrypt.hashpw(stud_pw_env.encode(), bcrypt.gensalt())
 testing_pw_env = os.getenv("TESTING_PASSWORD") or ""
 testing_pw = bcrypt.hashpw(testing_pw_env.encode(), bcrypt.gensalt())
 
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL") or 300)
+
 #
 # Constants
 #
@@ -49,6 +60,88 @@ TA_USERS: list[str] = [
     "xz498",
 ]
 
+#
+# Verified-credential cache
+#
+
+# Keyed by username. There are only three valid usernames, so the cache is bounded by
+# construction; a wrong password never replaces the entry for a right one. Each entry
+# holds an HMAC of the password under a per-process key (never the password itself),
+# the bcrypt hash it was verified against, and an expiry time.
+_cache_key: bytes = secrets.token_bytes(32)
+_verified: dict[str, tuple[bytes, bytes, float]] = {}
+
+
+def _digest(password: str) -> bytes:
+    return hmac.new(_cache_key, password.encode(), hashlib.sha256).digest()
+
+
+def _env_passwords() -> tuple[str, str, str]:
+    return (
+        os.getenv("ADMIN_PASSWORD") or "",
+        os.getenv("STUDENT_PASSWORD") or "",
+        os.getenv("TESTING_PASSWORD") or "",
+    )
+
+
+def reload_passwords() -> None:
+    """
+    Re-reads the password environment variables, rehashes them, and drops every cached
+    credential.
+    """
+    global adm_pw_env, adm_pw, stud_pw_env, stud_pw, testing_pw_env, testing_pw
+
+    adm_pw_env, stud_pw_env, testing_pw_env = _env_passwords()
+    adm_pw = bcrypt.hashpw(adm_pw_env.encode(), bcrypt.gensalt())
+    stud_pw = bcrypt.hashpw(stud_pw_env.encode(), bcrypt.gensalt())
+    testing_pw = bcrypt.hashpw(testing_pw_env.encode(), bcrypt.gensalt())
+
+    _verified.clear()
+
+
+def _check_password(username: str, password: str) -> bool:
+    """
+    Checks a password for one of the known users, consulting the verified-credential
+    cache before falling back to bcrypt.
+
+    If any of the password environment variables has changed since the hashes were
+    computed, the hashes are rebuilt and the cache is cleared first. A cache hit
+    requires an unexpired entry that was verified against the current bcrypt hash, and
+    the digests are compared in constant time.
+
+    Args:
+        username (str): One of "admin", "student" or "testing".
+        password (str): The plaintext password to check.
+
+    Returns:
+        bool: True if the password matches, otherwise False.
+    """
+    if _env_passwords() != (adm_pw_env, stud_pw_env, testing_pw_env):
+        reload_passwords()
+
+    hashed = {"admin": adm_pw, "student": stud_pw, "testing": testing_pw}[username]
+    digest = _digest(password)
+    now = time.monotonic()
+
+    entry = _verified.get(username)
+    if entry is not None:
+        cached_digest, cached_hash, expires = entry
+        if (
+            expires > now
+            and cached_hash is hashed
+            and hmac.compare_digest(cached_digest, digest)
+        ):
+            return True
+
+    if not bcrypt.checkpw(password.encode(), hashed):
+        return False
+
+    if AUTH_CACHE_TTL > 0:
+        _verified[username] = (digest, hashed, now + AUTH_CACHE_TTL)
+
+    return True
+
+
 #
 # Functions
 #
@@ -78,7 +171,7 @@ def verify_admin(cred: HTTPBasicCredentials) -> None:
     Raises:
         auth_exception: If the credentials do not match the admin username and password.
     """
-    if cred.username != "admin" or not bcrypt.checkpw(cred.password.encode(), adm_pw):
+    if cred.username != "admin" or not _check_password("admin", cred.password):
         raise auth_exception()
 
 
@@ -92,9 +185,7 @@ def verify_student(cred: HTTPBasicCredentials) -> None:
     Raises:
         HTTPException: If the username is not "student" or the password does not match the expected password.
     """
-    if cred.username != "student" or not bcrypt.checkpw(
-        cred.password.encode(), stud_pw
-    ):
+    if cred.username != "student" or not _check_password("student", cred.password):
         raise auth_exception()
 
 
@@ -113,7 +204,5 @@ def verify_ta_user(username: Optional[str]) -> None:
 
 
 def verify_testing(cred: HTTPBasicCredentials) -> None:
-    if cred.username != "testing" or not bcrypt.checkpw(
-        cred.password.encode(), testing_pw
-    ):
+    if cred.username != "testing" or not _check_password("testing", cred.password):
         raise auth_exception()
@@ -0,0 +1,135 @@
+"""
+bulk.py
+
+This module provides parsing for the bulk upload endpoints, which accept a file of
+records (e.g., a class roster) as either CSV or JSON, and hand them to a batched upsert.
+
+CSV files must have a header row naming the fields; empty cells are read as null. JSON
+files must hold an array of objects, all with the same keys, so that a single upsert
+can apply them. Either way, each record is validated against the endpoint's schema, and
+the fields the file actually provides are reported, so that an upsert can leave the
+others alone.
+
+Functions:
+    - read_upload(upload: UploadFile, model: type[M]) -> tuple[list[M], set[str]]:
+        Reads and validates every record in an uploaded CSV or JSON file.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Iterator, Optional, TypeVar
+
+from fastapi import HTTPException, UploadFile, status
+from pydantic import BaseModel, ValidationError
+
+#
+# Types
+#
+
+M = TypeVar("M", bound=BaseModel)
+
+#
+# Functions
+#
+
+
+def _is_json(upload: UploadFile) -> bool:
+    if upload.content_type and "json" in upload.content_type:
+        return True
+    return (upload.filename or "").lower().endswith(".json")
+
+
+def _json_records(content: bytes) -> list[Any]:
+    try:
+        records = json.loads(content)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid JSON upload: {e}",
+        )
+
+    if not isinstance(records, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="JSON upload must be an array of objects",
+        )
+
+    return records
+
+
+def _csv_records(content: bytes) -> Iterator[dict[str, Any]]:
+    try:
+        text = content.decode("utf-8-sig")  # Spreadsheet exports often have a BOM
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV upload must be UTF-8",
+        )
+
+    for row in csv.DictReader(io.StringIO(text)):
+        yield {
+            field.strip(): (value.strip() or None) if value is not None else None
+            for field, value in row.items()
+            if field is not None
+        }
+
+
+async def read_upload(upload: UploadFile, model: type[M]) -> tuple[list[M], set[str]]:
+    """
+    Reads and validates every record in an uploaded CSV or JSON file.
+
+    JSON is recognized by its content type or a .json file name; anything else is
+    read as CSV. Every record must provide the same fields (as every row of a CSV
+    file does), since a field left out of one record would otherwise be written as
+    null over the existing value.
+
+    Args:
+        upload (UploadFile): The uploaded file.
+        model (type[M]): The schema each record must match.
+
+    Returns:
+        tuple[list[M], set[str]]: The records, and the names of the model's fields
+        that the file provides.
+
+    Raises:
+        HTTPException (400): If the file can't be parsed.
+        HTTPException (422): If any record is invalid, or provides different fields
+            than the others, listing the first few.
+    """
+    content = await upload.read()
+    records = _json_records(content) if _is_json(upload) else _csv_records(content)
+
+    items: list[M] = []
+    fields: Optional[set[str]] = None
+    errors: list[str] = []
+
+    for number, record in enumerate(records, start=1):
+        try:
+            item = model.model_validate(record)
+        except ValidationError as e:
+            if len(errors) < 10:
+                error = e.errors()[0]
+                field = ".".join(str(part) for part in error["loc"]) or "record"
+                errors.append(f"Record {number}: {field}: {error['msg']}")
+            continue
+
+        items.append(item)
+
+        if fields is None:
+            fields = item.model_fields_set
+        elif item.model_fields_set != fields:
+            if len(errors) < 10:
+                differing = ", ".join(sorted(item.model_fields_set ^ fields))
+                errors.append(
+                    f"Record {number}: fields differ from earlier records' "
+                    f"({differing})"
+                )
+
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors,
+        )
+
+    return items, fields or set()
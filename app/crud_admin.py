@@ -5,40 +5,178 @@ This module provides CRUD operations for managing students, assignments, scoring
 and tokens in the database using SQLAlchemy and FastAPI.
 
 Functions:
-    add_student(db: Session, student: schemas.Student) -> models.Student
-    get_all_students(db: Session, skip: int = 0, limit: int = 100) -> Sequence[models.Student]
-    get_student_by_email(db: Session, email: str) -> Optional[models.Student]
-    update_student(db: Session, email: str, student: schemas.Student) -> Optional[models.Student]
-    delete_student_by_email(db: Session, email: str) -> Optional[models.Student]
-    add_assignment(db: Session, assignment: schemas.Assignment) -> models.Assignment
-    get_assignment_by_title(db: Session, title: str) -> Optional[models.Assignment]
-    get_scoring_subs_by_email(db: Session, email: str) -> Sequence[models.ScoringSubmission]
-    get_token_by_value(db: Session, value: str) -> Optional[models.Token]
-    create_token(db: Session, token_req: schemas.TokenRequest) -> models.Token
+    add_student(db: AsyncSession, student: schemas.Student) -> models.Student
+    upsert_students(db: AsyncSession, students: Sequence[schemas.Student], fields: Collection[str]) -> schemas.BulkUpsertResult
+    get_all_students(db: AsyncSession, skip: int = 0, limit: Optional[int] = 500, cursor: Optional[str] = None) -> pagination.Page[models.Student]
+    get_student_by_email(db: AsyncSession, email: str) -> Optional[models.Student]
+    update_student(db: AsyncSession, email: str, student: schemas.Student) -> Optional[models.Student]
+    delete_student_by_email(db: AsyncSession, email: str) -> Optional[models.Student]
+    add_assignment(db: AsyncSession, assignment: schemas.Assignment) -> models.Assignment
+    get_assignment_by_title(db: AsyncSession, title: str) -> Optional[models.Assignment]
+    upsert_assignments(db: AsyncSession, assignments: Sequence[schemas.Assignment], fields: Collection[str]) -> schemas.ScheduleUpsertResult
+    upsert_notebooks(db: AsyncSession, notebooks: Sequence[schemas.Notebook], fields: Collection[str]) -> schemas.ScheduleUpsertResult
+    get_scoring_subs_by_email(db: AsyncSession, email: str) -> Sequence[models.ScoringSubmission]
+    get_token_by_value(db: AsyncSession, value: str) -> Optional[models.Token]
+    create_token(db: AsyncSession, token_req: schemas.TokenRequest) -> models.Token
+    mint_tokens(db: AsyncSession, batch: schemas.TokenBatchRequest) -> list[schemas.Token]
 """
 
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Sequence
+import secrets
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional, Sequence
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import (
+    Float,
+    Insert,
+    Integer,
+    Numeric,
+    Table,
+    bindparam,
+    cast,
+    exists,
+    func,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import invalidation, models, pagination, reference_cache, schemas, token_cache
+
+#
+# Bulk upserts
+#
+
+
+def _refuse_duplicates(keys: Sequence[str], what: str) -> None:
+    # Postgres can't update the same row twice in one INSERT ... ON CONFLICT
+    counts = Counter(keys)
+    duplicates = sorted(key for key, count in counts.items() if count > 1)
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Duplicate {what}: {', '.join(duplicates[:10])}",
+        )
+
+
+def _rows(table: Table, columns: Sequence[str], records: Sequence[Any]) -> Any:
+    # The records' values for the given columns, as a derived table for INSERT ...
+    # SELECT. They are sent as one array per column, so that the statement is the
+    # same (and compiled once) whatever their number
+    return (
+        func.unnest(
+            *(
+                bindparam(
+                    f"{c}_list",
+                    [getattr(record, c) for record in records],
+                    type_=ARRAY(table.c[c].type),
+                )
+                for c in columns
+            )
+        )
+        .table_valued(*columns)
+        .render_derived(name="rows")
+    )
+
+
+def _upsert_stmt(
+    table: Table, key: str, columns: Sequence[str], records: Sequence[Any]
+) -> Insert:
+    # INSERT ... ON CONFLICT (key) DO UPDATE of the given columns, skipping rows
+    # where none of them would change (which also leaves those out of RETURNING)
+    rows = _rows(table, columns, records)
+
+    stmt = pg_insert(table).from_select(columns, select(rows))
+    updated_columns = [c for c in columns if c != key]
+    if not updated_columns:
+        return stmt.on_conflict_do_nothing(index_elements=[table.c[key]])
+
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c[key]],
+        set_={c: stmt.excluded[c] for c in updated_columns},
+        where=or_(
+            *(table.c[c].is_distinct_from(stmt.excluded[c]) for c in updated_columns)
+        ),
+    )
+
+
+# xmax is 0 for a freshly inserted row, and set for an updated one
+_was_inserted = literal_column("xmax = 0").label("inserted")
+
+
+async def _upsert_by_title(
+    db: AsyncSession,
+    model: type[models.Assignment] | type[models.Notebook],
+    items: Sequence[schemas.Assignment] | Sequence[schemas.Notebook],
+    fields: Collection[str],
+    batch_size: int,
+) -> schemas.ScheduleUpsertResult:
+    # Shared by upsert_assignments and upsert_notebooks
+    _refuse_duplicates([item.title for item in items], "titles")
+
+    table = model.__table__
+    schema = schemas.Assignment if model is models.Assignment else schemas.Notebook
+    columns = [f for f in schema.model_fields if f in fields or f == "title"]
+    titles = [item.title for item in items]
+
+    # Locked, so that the diff is exactly what this transaction changes
+    stmt = (
+        select(*(table.c[c] for c in columns))
+        .where(table.c.title.in_(titles))
+        .with_for_update()
+    )
+    old_rows = {row["title"]: row for row in (await db.execute(stmt)).mappings()}
+
+    result = schemas.ScheduleUpsertResult(inserted=[], updated={}, unchanged=[])
+
+    for start in range(0, len(items), batch_size):
+        batch = items[start : start + batch_size]
+        stmt = _upsert_stmt(table, "title", columns, batch).returning(
+            _was_inserted, *(table.c[c] for c in columns)
+        )
+
+        for row in (await db.execute(stmt)).mappings():
+            if row["inserted"]:
+                result.inserted.append(row["title"])
+                continue
+
+            old = old_rows.get(row["title"], {})
+            result.updated[row["title"]] = {
+                c: schemas.FieldChange(old=old.get(c), new=row[c])
+                for c in columns
+                if c != "title" and old.get(c) != row[c]
+            }
+
+    changed = set(result.inserted) | result.updated.keys()
+    result.unchanged = [title for title in titles if title not in changed]
+
+    # Once for the whole schedule, rather than once per row
+    if changed:
+        await invalidation.publish(db, "reference")
+    await db.commit()
+    if changed:
+        reference_cache.invalidate()
+
+    return result
 
-from . import models, schemas
 
 #
 # Students table
 #
 
 
-def add_student(db: Session, student: schemas.Student) -> models.Student:
+async def add_student(db: AsyncSession, student: schemas.Student) -> models.Student:
     """
     Add a new student to the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         student (schemas.Student): The student data to be added.
 
     Returns:
@@ -53,59 +191,117 @@ def add_student(db: Session, student: schemas.Student) -> models.Student:
     )
 
     db.add(db_student)
-    db.commit()
-    db.refresh(db_student)
+    await db.commit()
+    await db.refresh(db_student)
 
     return db_student
 
 
-def get_all_students(
-    db: Session, skip: int = 0, limit: int = 500
-) -> Sequence[models.Student]:
+async def upsert_students(
+    db: AsyncSession,
+    students: Sequence[schemas.Student],
+    fields: Collection[str],
+    batch_size: int = 10000,
+) -> schemas.BulkUpsertResult:
     """
-    Retrieve a list of students from the database, ordered by family name.
+    Add or update many students at once (e.g., a class roster), in one transaction.
+
+    Students are matched by email. Only the given fields are written to existing
+    students, and only if they differ, so that re-importing a roster is a no-op.
 
     Args:
-        db (Session): The database session to use for the query.
-        skip (int, optional): The number of records to skip. Defaults to 0.
-        limit (int, optional): The maximum number of records to return. Defaults to 100.
+        db (AsyncSession): The database session to use for the operation.
+        students (Sequence[schemas.Student]): The students to add or update.
+        fields (Collection[str]): The fields provided by the roster; others are left
+            as they are for existing students.
+        batch_size (int): Number of students per INSERT statement.
 
     Returns:
-        Sequence[models.Student]: A list of student records.
+        schemas.BulkUpsertResult: Counts of inserted, updated and unchanged students.
+
+    Raises:
+        HTTPException (400): If an email address appears more than once.
     """
-    stmt = (
-        select(models.Student)
-        .order_by(models.Student.family_name)
-        .offset(skip)
-        .limit(limit)
+    _refuse_duplicates([student.email for student in students], "emails in roster")
+
+    # Email is required, so always provided
+    columns = [f for f in schemas.Student.model_fields if f in fields or f == "email"]
+    table = models.Student.__table__
+
+    inserted = updated = 0
+
+    for start in range(0, len(students), batch_size):
+        batch = students[start : start + batch_size]
+        stmt = _upsert_stmt(table, "email", columns, batch).returning(_was_inserted)
+
+        results = (await db.execute(stmt)).scalars().all()
+        inserted += sum(results)
+        updated += len(results) - sum(results)
+
+    await db.commit()
+
+    return schemas.BulkUpsertResult(
+        inserted=inserted,
+        updated=updated,
+        unchanged=len(students) - inserted - updated,
     )
 
-    return db.execute(stmt).scalars().all()
+
+async def get_all_students(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: Optional[int] = 500,
+    cursor: Optional[str] = None,
+) -> pagination.Page[models.Student]:
+    """
+    Retrieve a page of students from the database, ordered by family name (then ID).
+
+    Args:
+        db (AsyncSession): The database session to use for the query.
+        skip (int, optional): The number of records to skip. Defaults to 0. Prefer
+            cursor, which does not get slower as you page deeper.
+        limit (Optional[int], optional): The page size; None for all. Defaults to 500.
+        cursor (Optional[str], optional): The previous page's next_cursor.
+
+    Returns:
+        pagination.Page[models.Student]: The students, and the next page's cursor.
+    """
+    stmt = select(models.Student).offset(skip)
+
+    return await pagination.paginate(
+        db,
+        stmt,
+        keys=(models.Student.family_name, models.Student.id),
+        cursor=cursor,
+        limit=limit,
+    )
 
 
-def get_student_by_email(db: Session, email: str) -> Optional[models.Student]:
+async def get_student_by_email(
+    db: AsyncSession, email: str
+) -> Optional[models.Student]:
     """
     Retrieve a student record from the database by email.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         email (str): The email address of the student to retrieve.
 
     Returns:
         Optional[models.Student]: The student record if found, otherwise None.
     """
     stmt = select(models.Student).where(models.Student.email == email)
-    return db.execute(stmt).scalar_one_or_none()
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
-def update_student(
-    db: Session, email: str, student: schemas.Student
+async def update_student(
+    db: AsyncSession, email: str, student: schemas.Student
 ) -> Optional[models.Student]:
     """
     Update a student's information in the database.
 
     Args:
-        db (Session): The database session to use for the update.
+        db (AsyncSession): The database session to use for the update.
         email (str): The email of the student to update.
         student (schemas.Student): The new student data to update.
 
@@ -117,13 +313,13 @@ def update_student(
         HTTPException: If the new email is already registered to another student.
     """
     stmt = select(models.Student).where(models.Student.email == email)
-    db_student = db.execute(stmt).scalar_one_or_none()
+    db_student = (await db.execute(stmt)).scalar_one_or_none()
     if not db_student:
         return None
 
     if email != student.email:
         stmt = select(models.Student).where(models.Student.email == student.email)
-        existing_email = db.execute(stmt).scalar_one_or_none()
+        existing_email = (await db.execute(stmt)).scalar_one_or_none()
 
         if existing_email:
             raise HTTPException(
@@ -142,31 +338,33 @@ def update_student(
     if student.lab_section is not None:
         db_student.lab_section = student.lab_section
 
-    db.commit()
-    db.refresh(db_student)
+    await db.commit()
+    await db.refresh(db_student)
 
     return db_student
 
 
-def delete_student_by_email(db: Session, email: str) -> Optional[models.Student]:
+async def delete_student_by_email(
+    db: AsyncSession, email: str
+) -> Optional[models.Student]:
     """
     Delete a student from the database by their email.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         email (str): The email of the student to delete.
 
     Returns:
         Optional[models.Student]: The deleted student object if found and deleted, otherwise None.
     """
     stmt = select(models.Student).where(models.Student.email == email)
-    db_student = db.execute(stmt).scalar_one_or_none()
+    db_student = (await db.execute(stmt)).scalar_one_or_none()
 
     if not db_student:
         return None
 
-    db.delete(db_student)
-    db.commit()
+    await db.delete(db_student)
+    await db.commit()
 
     return db_student
 
@@ -176,12 +374,14 @@ def delete_student_by_email(db: Session, email: str) -> Optional[models.Student]
 #
 
 
-def add_assignment(db: Session, assignment: schemas.Assignment) -> models.Assignment:
+async def add_assignment(
+    db: AsyncSession, assignment: schemas.Assignment
+) -> models.Assignment:
     """
     Add a new assignment to the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         assignment (schemas.Assignment): The assignment data to be added.
 
     Returns:
@@ -197,40 +397,53 @@ def add_assignment(db: Session, assignment: schemas.Assignment) -> models.Assign
     )
 
     db.add(db_assignment)
-    db.commit()
-    db.refresh(db_assignment)
+    await invalidation.publish(db, "reference", assignment.title)
+    await db.commit()
+    reference_cache.invalidate()
+    await db.refresh(db_assignment)
 
     return db_assignment
 
 
-def get_assignment_by_title(db: Session, title: str) -> Optional[models.Assignment]:
+async def get_assignment_by_title(
+    db: AsyncSession, title: str
+) -> Optional[models.Assignment]:
     """
     Retrieve an assignment from the database by its title.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         title (str): The title of the assignment to retrieve.
 
     Returns:
         Optional[models.Assignment]: The assignment object if found, otherwise None.
     """
     stmt = select(models.Assignment).where(models.Assignment.title == title)
-    return db.execute(stmt).scalar_one_or_none()
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
-def get_assignments(db: Session) -> Sequence[models.Assignment]:
+async def get_assignments(
+    db: AsyncSession, cursor: Optional[str] = None, limit: Optional[int] = None
+) -> pagination.Page[models.Assignment]:
     """
-    Retrieve all assignments from the database.
+    Retrieve a page of assignments from the database, ordered by ID.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
+        cursor (Optional[str]): The previous page's next_cursor; None to start.
+        limit (Optional[int]): The page size; None for all.
 
     Returns:
-        Sequence[models.Assignment]: A sequence of Assignment objects.
+        pagination.Page[models.Assignment]: The assignments, and the next page's
+        cursor.
     """
     try:
         stmt = select(models.Assignment)
-        return db.execute(stmt).scalars().all()
+        return await pagination.paginate(
+            db, stmt, keys=(models.Assignment.id,), cursor=cursor, limit=limit
+        )
+    except HTTPException:
+        raise  # e.g., a bad cursor
     except SQLAlchemyError as e:
         # Handle database-related errors
         raise HTTPException(
@@ -245,14 +458,14 @@ def get_assignments(db: Session) -> Sequence[models.Assignment]:
         )
 
 
-def update_assignment(
-    db: Session, title: str, assignment: schemas.Assignment
+async def update_assignment(
+    db: AsyncSession, title: str, assignment: schemas.Assignment
 ) -> models.Assignment:
     """
     Add a new assignment to the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         assignment (schemas.Assignment): The assignment data to be added.
 
     Returns:
@@ -260,7 +473,7 @@ def update_assignment(
     """
 
     stmt = select(models.Assignment).where(models.Assignment.title == title)
-    db_assignment = db.execute(stmt).scalar_one_or_none()
+    db_assignment = (await db.execute(stmt)).scalar_one_or_none()
 
     if not db_assignment:
         raise HTTPException(
@@ -275,23 +488,57 @@ def update_assignment(
     db_assignment.week_number = assignment.week_number
     db_assignment.assignment_type = assignment.assignment_type
 
-    db.commit()
-    db.refresh(db_assignment)
+    await invalidation.publish(db, "reference", assignment.title)
+    await db.commit()
+    reference_cache.invalidate()
+    await db.refresh(db_assignment)
 
     return db_assignment
 
 
+async def upsert_assignments(
+    db: AsyncSession,
+    assignments: Sequence[schemas.Assignment],
+    fields: Collection[str],
+    batch_size: int = 1000,
+) -> schemas.ScheduleUpsertResult:
+    """
+    Add or update many assignments at once (e.g., a term's schedule), in one
+    transaction.
+
+    Assignments are matched by title. Only the given fields are written to existing
+    assignments, and only if they differ, so that re-publishing a schedule is a no-op.
+
+    Args:
+        db (AsyncSession): The database session to use for the operation.
+        assignments (Sequence[schemas.Assignment]): The assignments to add or update.
+        fields (Collection[str]): The fields provided by the schedule; others are
+            left as they are for existing assignments.
+        batch_size (int): Number of assignments per INSERT statement.
+
+    Returns:
+        schemas.ScheduleUpsertResult: The titles inserted and left unchanged, and
+        the old and new values of each changed field, by title.
+
+    Raises:
+        HTTPException (400): If a title appears more than once.
+    """
+    return await _upsert_by_title(
+        db, models.Assignment, assignments, fields, batch_size
+    )
+
+
 #
 # Notebooks table
 #
 
 
-def add_notebook(db: Session, notebook: schemas.Notebook) -> models.Notebook:
+async def add_notebook(db: AsyncSession, notebook: schemas.Notebook) -> models.Notebook:
     """
     Add a new notebook to the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         notebook (schemas.Notebook): The notebook data to be added.
 
     Returns:
@@ -306,56 +553,66 @@ def add_notebook(db: Session, notebook: schemas.Notebook) -> models.Notebook:
     )
 
     db.add(db_notebook)
-    db.commit()
-    db.refresh(db_notebook)
+    await invalidation.publish(db, "reference", notebook.title)
+    await db.commit()
+    reference_cache.invalidate()
+    await db.refresh(db_notebook)
 
     return db_notebook
 
 
-def get_notebook_by_title(db: Session, title: str) -> Optional[models.Notebook]:
+async def get_notebook_by_title(
+    db: AsyncSession, title: str
+) -> Optional[models.Notebook]:
     """
     Retrieve a notebook from the database by its title.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         title (str): The title of the notebook to retrieve.
 
     Returns:
         Optional[models.Notebook]: The notebook object if found, otherwise None.
     """
     stmt = select(models.Notebook).where(models.Notebook.title == title)
-    return db.execute(stmt).scalar_one_or_none()
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
-def get_notebooks(db: Session) -> Sequence[models.Notebook]:
+async def get_notebooks(
+    db: AsyncSession, cursor: Optional[str] = None, limit: Optional[int] = None
+) -> pagination.Page[models.Notebook]:
     """
-    Retrieve all notebooks from the database.
+    Retrieve a page of notebooks from the database, ordered by ID.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
+        cursor (Optional[str]): The previous page's next_cursor; None to start.
+        limit (Optional[int]): The page size; None for all.
 
     Returns:
-        Sequence[models.Notebook]: A sequence of Notebook objects.
+        pagination.Page[models.Notebook]: The notebooks, and the next page's cursor.
     """
     stmt = select(models.Notebook)
-    return db.execute(stmt).scalars().all()
+    return await pagination.paginate(
+        db, stmt, keys=(models.Notebook.id,), cursor=cursor, limit=limit
+    )
 
 
-def update_notebook(
-    db: Session, title: str, notebook: schemas.Notebook
+async def update_notebook(
+    db: AsyncSession, title: str, notebook: schemas.Notebook
 ) -> models.Notebook:
     """
     Adds a new notebook to the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         notebook (schemas.Notebook): The notebook data to be added
 
     Returns:
         models.Notebook: The newly created notebook object.
     """
     stmt = select(models.Notebook).where(models.Notebook.title == title)
-    db_notebook = db.execute(stmt).scalar_one_or_none()
+    db_notebook = (await db.execute(stmt)).scalar_one_or_none()
 
     if not db_notebook:
         raise HTTPException(
@@ -369,30 +626,59 @@ def update_notebook(
     db_notebook.max_score = notebook.max_score
     db_notebook.due_date = notebook.due_date
 
-    db.commit()
-    db.refresh(db_notebook)
+    await invalidation.publish(db, "reference", notebook.title)
+    await db.commit()
+    reference_cache.invalidate()
+    await db.refresh(db_notebook)
 
     return db_notebook
 
 
+async def upsert_notebooks(
+    db: AsyncSession,
+    notebooks: Sequence[schemas.Notebook],
+    fields: Collection[str],
+    batch_size: int = 1000,
+) -> schemas.ScheduleUpsertResult:
+    """
+    Add or update many notebooks at once, in one transaction, as upsert_assignments
+    does for assignments.
+
+    Args:
+        db (AsyncSession): The database session to use for the operation.
+        notebooks (Sequence[schemas.Notebook]): The notebooks to add or update.
+        fields (Collection[str]): The fields provided by the schedule; others are
+            left as they are for existing notebooks.
+        batch_size (int): Number of notebooks per INSERT statement.
+
+    Returns:
+        schemas.ScheduleUpsertResult: The titles inserted and left unchanged, and
+        the old and new values of each changed field, by title.
+
+    Raises:
+        HTTPException (400): If a title appears more than once.
+    """
+    return await _upsert_by_title(db, models.Notebook, notebooks, fields, batch_size)
+
+
 #
 # Questions table
 #
 
 
-def add_question(db: Session, question: schemas.Question) -> models.Question:
+async def add_question(db: AsyncSession, question: schemas.Question) -> models.Question:
     """
     Add a new question to the database
 
     Args:
-        db (Session): Database session to use for the operation.
+        db (AsyncSession): Database session to use for the operation.
         question (schemas.Question): Question metadata to be added
 
     Returns:
         models.Question: The newly created question object
     """
     stmt = select(models.Question).where(models.Question.title == question.title)
-    existing_question = db.execute(stmt).scalar_one_or_none()
+    existing_question = (await db.execute(stmt)).scalar_one_or_none()
     if existing_question:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -409,8 +695,8 @@ def add_question(db: Session, question: schemas.Question) -> models.Question:
     )
 
     db.add(db_question)
-    db.commit()
-    db.refresh(db_question)
+    await db.commit()
+    await db.refresh(db_question)
 
     return db_question
 
@@ -420,14 +706,14 @@ def add_question(db: Session, question: schemas.Question) -> models.Question:
 #
 
 
-def get_scoring_subs_by_email(
-    db: Session, email: str
+async def get_scoring_subs_by_email(
+    db: AsyncSession, email: str
 ) -> Sequence[models.AssignmentSubmission]:
     """
     Retrieve scoring submissions by student email.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         email (str): The email address of the student.
 
     Returns:
@@ -447,7 +733,7 @@ def get_scoring_subs_by_email(
     )
 
     try:
-        results = db.execute(stmt).scalar()  # .all()
+        results = (await db.execute(stmt)).scalar()  # .all()
         if not results:
             raise NoResultFound(f"No submissions found for email: {email}")
         return results
@@ -459,13 +745,135 @@ def get_scoring_subs_by_email(
 # Tokens table
 #
 
+# Minted token values leave out look-alike characters (0/O, 1/I/l), since students
+# may have to type them in; 10 of the remaining 31 give about 50 bits
+MINTED_TOKEN_ALPHABET = "23456789ABCDEFGHJKMNPQRSTUVWXYZ"
+MINTED_TOKEN_LENGTH = 10
+
+
+def _mint_token_value() -> str:
+    return "".join(
+        secrets.choice(MINTED_TOKEN_ALPHABET) for _ in range(MINTED_TOKEN_LENGTH)
+    )
+
 
-def create_token_testing(db: Session, token_req: schemas.TokenRequest) -> models.Token:
+async def mint_tokens(
+    db: AsyncSession, batch: schemas.TokenBatchRequest
+) -> list[schemas.Token]:
+    """
+    Create a token for each of a list of students, or for each student in a lecture
+    and/or lab section, with random values, in one transaction.
+
+    Args:
+        db (AsyncSession): The database session to use for the operation.
+        batch (schemas.TokenBatchRequest): The students, assignment and duration.
+
+    Returns:
+        list[schemas.Token]: The new tokens, ordered by student email.
+
+    Raises:
+        HTTPException (400): If both or neither of students and sections are given,
+            or if any of the given students is not in the students table.
+        HTTPException (404): If the given sections have no students.
+    """
+    by_section = batch.lecture_section is not None or batch.lab_section is not None
+    if (batch.student_emails is not None) == by_section:  # Exactly one is needed
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either student_emails or a lecture/lab section",
+        )
+
+    stmt = select(models.Student.email).order_by(models.Student.email)
+    if batch.student_emails is not None:
+        emails = sorted(set(batch.student_emails))
+        stmt = stmt.where(models.Student.email.in_(emails))
+    else:
+        if batch.lecture_section is not None:
+            stmt = stmt.where(models.Student.lecture_section == batch.lecture_section)
+        if batch.lab_section is not None:
+            stmt = stmt.where(models.Student.lab_section == batch.lab_section)
+
+    known = (await db.execute(stmt)).scalars().all()
+
+    if batch.student_emails is not None:
+        unknown = sorted(set(emails) - set(known))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown students: {', '.join(unknown[:10])}",
+            )
+    elif not known:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No students found in the given section(s)",
+        )
+
+    created = datetime.now(timezone.utc)
+    expires = created + timedelta(minutes=batch.duration)
+    table = models.Token.__table__
+    columns = list(schemas.Token.model_fields)
+
+    minted: list[schemas.Token] = []
+    remaining = list(known)
+
+    # A value already taken (vanishingly unlikely) is skipped by ON CONFLICT, and
+    # that student's token is minted again
+    for _ in range(5):
+        tokens = [
+            schemas.Token(
+                value=_mint_token_value(),
+                created=created,
+                expires=expires,
+                requester=batch.requester,
+                student_id=email,
+                assignment=batch.assignment,
+            )
+            for email in remaining
+        ]
+
+        stmt = (
+            pg_insert(table)
+            .from_select(columns, select(_rows(table, columns, tokens)))
+            .on_conflict_do_nothing(index_elements=[table.c.value])
+            .returning(table.c.value)
+        )
+        inserted = set((await db.execute(stmt)).scalars().all())
+
+        remaining = []
+        for token in tokens:
+            # A value drawn twice in this batch was inserted once
+            if token.value in inserted:
+                inserted.remove(token.value)
+                minted.append(token)
+            else:
+                remaining.append(token.student_id)
+
+        if not remaining:
+            break
+    else:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not mint unique token values",
+        )
+
+    # The values are new, so only entries cached as not found can be stale; one
+    # message dropping everything is cheaper than one per value
+    await invalidation.publish(db, "tokens")
+    await db.commit()
+    token_cache.invalidate()
+
+    return sorted(minted, key=lambda token: token.student_id or "")
+
+
+async def create_token_testing(
+    db: AsyncSession, token_req: schemas.TokenRequest
+) -> models.Token:
     """
     Create a new token and store it in the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         token_req (schemas.TokenRequest): The token request containing the value and duration for the token.
 
     Returns:
@@ -482,18 +890,22 @@ def create_token_testing(db: Session, token_req: schemas.TokenRequest) -> models
     )
 
     db.add(db_token)
-    db.commit()
-    db.refresh(db_token)
+    await invalidation.publish(db, "tokens", token_req.value)
+    await db.commit()
+    token_cache.invalidate(token_req.value)
+    await db.refresh(db_token)
 
     return db_token
 
 
-def create_token(db: Session, token_req: schemas.TokenRequest) -> models.Token:
+async def create_token(
+    db: AsyncSession, token_req: schemas.TokenRequest
+) -> models.Token:
     """
     Create a new token and store it in the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         token_req (schemas.TokenRequest): The token request containing the value and duration for the token.
 
     Returns:
@@ -512,45 +924,53 @@ def create_token(db: Session, token_req: schemas.TokenRequest) -> models.Token:
     )
 
     db.add(db_token)
-    db.commit()
-    db.refresh(db_token)
+    await invalidation.publish(db, "tokens", token_req.value)
+    await db.commit()
+    token_cache.invalidate(token_req.value)
+    await db.refresh(db_token)
 
     return db_token
 
 
-def get_all_tokens(db: Session) -> Sequence[models.Token]:
+async def get_all_tokens(
+    db: AsyncSession, cursor: Optional[str] = None, limit: Optional[int] = None
+) -> pagination.Page[models.Token]:
     """
-    Retrieve all tokens from the database
+    Retrieve a page of tokens from the database, ordered by ID
 
     Args:
-        db (Session): The database session to use for the query
+        db (AsyncSession): The database session to use for the query
+        cursor (Optional[str]): The previous page's next_cursor; None to start
+        limit (Optional[int]): The page size; None for all
 
     Returns:
-        Sequence[models.Token]: A sequence of Token objects
+        pagination.Page[models.Token]: The tokens, and the next page's cursor
     """
     stmt = select(models.Token)
-    return db.execute(stmt).scalars().all()
+    return await pagination.paginate(
+        db, stmt, keys=(models.Token.id,), cursor=cursor, limit=limit
+    )
 
 
-def get_token_by_value(db: Session, value: str) -> Optional[models.Token]:
+async def get_token_by_value(db: AsyncSession, value: str) -> Optional[models.Token]:
     """
     Retrieve a token from the database by its value.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         value (str): The value of the token to retrieve.
 
     Returns:
         Optional[models.Token]: The token object if found, otherwise None.
     """
     stmt = select(models.Token).where(models.Token.value == value)
-    return db.execute(stmt).scalar_one_or_none()
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
 # TODO: Add a way to track history of all tokens
-def update_token(db: Session, token: schemas.TokenRequest):
+async def update_token(db: AsyncSession, token: schemas.TokenRequest):
     stmt = select(models.Token).where(models.Token.value == token.value)
-    db_token = db.execute(stmt).scalar_one_or_none()
+    db_token = (await db.execute(stmt)).scalar_one_or_none()
 
     if not db_token:
         raise HTTPException(
@@ -565,31 +985,35 @@ def update_token(db: Session, token: schemas.TokenRequest):
     db_token.student_id = token.student_id
     db_token.assignment = token.assignment
 
-    db.commit()
-    db.refresh(db_token)
+    await invalidation.publish(db, "tokens", token.value)
+    await db.commit()
+    token_cache.invalidate(token.value)
+    await db.refresh(db_token)
 
     return db_token
 
 
-def delete_token(db: Session, token_value: str) -> Optional[models.Token]:
+async def delete_token(db: AsyncSession, token_value: str) -> Optional[models.Token]:
     """
     Delete a token, identified by its value, from the database
 
     Args:
-        db (Session): Database session to use for the operation
+        db (AsyncSession): Database session to use for the operation
         token_value (str): Value of the token to delete
 
     Returns:
         Optional[models.Token]: Deleted token object if found and deleted; else None
     """
     stmt = select(models.Token).where(models.Token.value == token_value)
-    db_token = db.execute(stmt).scalar_one_or_none()
+    db_token = (await db.execute(stmt)).scalar_one_or_none()
 
     if not db_token:
         return None
 
-    db.delete(db_token)
-    db.commit()
+    await db.delete(db_token)
+    await invalidation.publish(db, "tokens", token_value)
+    await db.commit()
+    token_cache.invalidate(token_value)
 
     return db_token
 
@@ -599,7 +1023,9 @@ def delete_token(db: Session, token_value: str) -> Optional[models.Token]:
 #
 
 
-def find_best_submission_id(db: Session, student_email: str, assignment: str) -> int:
+async def find_best_submission_id(
+    db: AsyncSession, student_email: str, assignment: str
+) -> int:
     # Given student email and assignment name, find the ID (sic) of the
     # submission with the highest submitted_score value
     # TODO: Consider choosing the submission with the highest raw_score instead
@@ -611,7 +1037,7 @@ def find_best_submission_id(db: Session, student_email: str, assignment: str) ->
         )
         .order_by(models.AssignmentSubmission.submitted_score.desc())
     )
-    result = db.execute(stmt).scalar_one_or_none()
+    result = (await db.execute(stmt)).scalar_one_or_none()
 
     if not result:
         raise HTTPException(
@@ -622,18 +1048,35 @@ def find_best_submission_id(db: Session, student_email: str, assignment: str) ->
     return result
 
 
-def get_all_assignment_subs(db: Session) -> Sequence[models.AssignmentSubmission]:
+async def get_all_assignment_subs(
+    db: AsyncSession, cursor: Optional[str] = None, limit: Optional[int] = None
+) -> pagination.Page[models.AssignmentSubmission]:
     stmt = select(models.AssignmentSubmission)
-    return db.execute(stmt).scalars().all()
+    return await pagination.paginate(
+        db,
+        stmt,
+        keys=(models.AssignmentSubmission.id,),
+        cursor=cursor,
+        limit=limit,
+    )
 
 
-def get_all_submission_emails(db: Session) -> List[str]:
+async def get_all_submission_emails(
+    db: AsyncSession, cursor: Optional[str] = None, limit: Optional[int] = None
+) -> pagination.Page[str]:
     stmt = select(models.AssignmentSubmission.student_email).distinct()
-    return [row.student_email for row in db.execute(stmt).all()]
+    return await pagination.paginate(
+        db,
+        stmt,
+        keys=(models.AssignmentSubmission.student_email,),
+        cursor=cursor,
+        limit=limit,
+        key_of=lambda email: [email],
+    )
 
 
-def get_assignment_grades(
-    db: Session,
+async def get_assignment_grades(
+    db: AsyncSession,
     week_number: int,
     assignment_type: str,
 ) -> List[Dict[str, float]]:
@@ -641,13 +1084,15 @@ def get_assignment_grades(
     Retrieve the best max score for each unique student for a given week number and assignment.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         week_number (int): The week number to filter submissions.
         assignment (str): The assignment name to filter submissions.
 
     Returns:
         List[Dict[str, float]]: A list of dictionaries containing student email and their best score.
     """
+    # Unlike the other grade reads, this one filters each submission by its own week,
+    # which student_best_scores doesn't track; the covering index keeps it cheap
     stmt = (
         select(
             models.AssignmentSubmission.student_email,
@@ -660,7 +1105,7 @@ def get_assignment_grades(
         .group_by(models.AssignmentSubmission.student_email)
     )
 
-    result = db.execute(stmt).all()
+    result = (await db.execute(stmt)).all()
 
     # Convert the result into a list of dictionaries
     return [
@@ -669,88 +1114,137 @@ def get_assignment_grades(
     ]
 
 
-def get_grades_testing(db: Session):
-    student_submission_map = {}
+async def get_grades_testing(
+    db: AsyncSession, batch_size: int = 500
+) -> dict[str, list[models.AssignmentSubmission]]:
+    """
+    Retrieve each student's best submission for every assignment, in one query.
 
-    assignments = get_assignments(db)
+    A submission counts only if its assignment and week number match an assignment in
+    the assignments table. The best submission has the highest current_max_score;
+    ties go to the earliest. Rows are read through a server-side cursor, batch_size
+    at a time.
 
-    for assignment in assignments:
-        all_relevant_submissions_stmt = select(models.AssignmentSubmission).where(
-            models.AssignmentSubmission.assignment == assignment.title,
-            models.AssignmentSubmission.week_number == assignment.week_number,
+    Args:
+        db (AsyncSession): The database session to use for the query.
+        batch_size (int): Number of rows to fetch per round trip.
+
+    Returns:
+        dict[str, list[models.AssignmentSubmission]]: Best submissions by student
+        email, ordered by assignment title.
+    """
+    ranked = (
+        select(
+            models.AssignmentSubmission.id,
+            func.row_number()
+            .over(
+                partition_by=(
+                    models.AssignmentSubmission.student_email,
+                    models.AssignmentSubmission.assignment,
+                ),
+                order_by=(
+                    models.AssignmentSubmission.current_max_score.desc(),
+                    models.AssignmentSubmission.id,
+                ),
+            )
+            .label("rank"),
         )
-        all_relevant_submissions = (
-            db.execute(all_relevant_submissions_stmt).scalars().all()
+        .where(
+            exists().where(
+                models.Assignment.title == models.AssignmentSubmission.assignment,
+                models.Assignment.week_number
+                == models.AssignmentSubmission.week_number,
+            )
         )
+        .subquery()
+    )
 
-        for submission in all_relevant_submissions:
-            if submission.student_email not in student_submission_map:
-                student_submission_map[submission.student_email] = submission
-                continue
+    stmt = (
+        select(models.AssignmentSubmission)
+        .join(ranked, ranked.c.id == models.AssignmentSubmission.id)
+        .where(ranked.c.rank == 1)
+        .order_by(
+            models.AssignmentSubmission.student_email,
+            models.AssignmentSubmission.assignment,
+        )
+        .execution_options(yield_per=batch_size)
+    )
 
-            for i, student_submission in enumerate(
-                student_submission_map[submission.student_email]
-            ):
-                if (
-                    student_submission.assignment == submission.assignment
-                    and student_submission.current_max_score
-                    < submission.current_max_score
-                ):
-                    student_submission_map[submission.student_email][i] = submission
-                    break
-            else:
-                student_submission_map[submission.student_email].append(submission)
+    student_submission_map: dict[str, list[models.AssignmentSubmission]] = {}
+
+    result = await db.stream_scalars(stmt)
+    async for partition in result.partitions():
+        for submission in partition:
+            student_submission_map.setdefault(submission.student_email, []).append(
+                submission
+            )
 
     return student_submission_map
 
 
-def get_student_grades(db: Session) -> list[schemas.StudentGrades]:
+async def get_graded_assignments(db: AsyncSession) -> list[str]:
     """
-    Retrieve student grades as a list of dictionaries.
+    Retrieve the titles of all assignments that have at least one graded submission.
 
-    :param db: SQLAlchemy session
-    :return: A list of dicts containing student emails and their best assignment scores.
+    :param db: SQLAlchemy async session
+    :return: The titles, sorted
     """
+    stmt = select(models.StudentBestScore.assignment).distinct()
+    return sorted((await db.execute(stmt)).scalars().all())
 
-    # Query the database to get the best score per assignment for each student
-    stmt = (
-        select(
-            models.AssignmentSubmission.student_email,
-            models.AssignmentSubmission.assignment,
-            func.max(models.AssignmentSubmission.submitted_score).label("best_score"),
-        )
-        .group_by(
-            models.AssignmentSubmission.student_email,
-            models.AssignmentSubmission.assignment,
-        )
-        .order_by(models.AssignmentSubmission.student_email)
-    )
-
-    # Execute the query
-    results = db.execute(stmt).tuples().all()
 
-    # Organize results into the desired structure
-    student_grades: dict[str, dict[str, Any]] = defaultdict(lambda: {"grades": {}})
+async def stream_gradebook(
+    db: AsyncSession, assignments: list[str], batch_size: int = 500
+) -> AsyncIterator[tuple[Any, ...]]:
+    """
+    Stream the gradebook, one ready-made row per student.
 
-    for student_email, assignment, best_score in results:
-        if student_email not in student_grades:
-            student_grades[student_email]["student_email"] = student_email
-        percentage_score = (
-            round(best_score * 100, 2) if best_score is not None else 0.00
-        )
-        student_grades[student_email]["grades"][assignment] = percentage_score
+    The pivot happens in Postgres: each row is the student's email followed by their
+    best percentage score on each of the given assignments, in order (0.0 where they
+    have none), rounded to two decimal places. Rows are read through a server-side
+    cursor, batch_size at a time, ordered by student.
 
-    # Convert to a list of dicts
-    return [
-        schemas.StudentGrades(
-            student_email=student["student_email"], grades=student["grades"]
+    :param db: SQLAlchemy async session
+    :param assignments: The assignment titles to use as columns
+    :param batch_size: Number of rows to fetch per round trip
+    :return: An async iterator of (student email, score, score, ...)
+    """
+    best = models.StudentBestScore
+    columns = [
+        func.coalesce(
+            cast(
+                func.round(
+                    cast(
+                        func.max(best.best_score).filter(best.assignment == title)
+                        * 100,
+                        Numeric,
+                    ),
+                    2,
+                ),
+                Float,
+            ),
+            0.0,
         )
-        for student in student_grades.values()
+        for title in assignments
     ]
 
+    stmt = (
+        select(best.student_email, *columns)
+        .group_by(best.student_email)
+        .order_by(best.student_email)
+        .execution_options(yield_per=batch_size)
+    )
 
-def update_assignment_score(
-    db: Session,
+    result = await db.stream(stmt)
+
+    # Iterated a batch at a time, since awaiting each row separately is far slower
+    async for partition in result.partitions():
+        for row in partition:
+            yield tuple(row)
+
+
+async def update_assignment_score(
+    db: AsyncSession,
     submission_id: int,
     student_email: str,
     assignment: str,
@@ -760,7 +1254,7 @@ def update_assignment_score(
     stmt = select(models.AssignmentSubmission).where(
         models.AssignmentSubmission.id == submission_id
     )
-    db_submission = db.execute(stmt).scalar_one_or_none()
+    db_submission = (await db.execute(stmt)).scalar_one_or_none()
 
     # Raise 500 because the ID will have come from another CRUD function
     # i.e., the request itself has already been validated
@@ -781,14 +1275,130 @@ def update_assignment_score(
         )
 
     db_submission.updated_score = new_score
-    db.commit()
-    db.refresh(db_submission)
+    await db.commit()
+    await db.refresh(db_submission)
 
     return db_submission
 
 
-def delete_completed_assignment(
-    db: Session,
+async def update_assignment_scores(
+    db: AsyncSession, updates: Sequence[schemas.GradeUpdateRequest]
+) -> schemas.BulkGradeUpdateResult:
+    """
+    Apply many grade overrides at once, in one transaction.
+
+    Each override goes to the student's best submission for the assignment, as with
+    find_best_submission_id and update_assignment_score; all are resolved with one
+    window-function query and written with a single UPDATE ... FROM. An override
+    that can't be applied is reported, and doesn't stop the others.
+
+    Args:
+        db (AsyncSession): The database session to use for the operation.
+        updates (Sequence[schemas.GradeUpdateRequest]): The overrides.
+
+    Returns:
+        schemas.BulkGradeUpdateResult: The number of submissions updated, and the
+        overrides not applied, with the reason for each.
+    """
+    errors: list[schemas.GradeUpdateError] = []
+    first_records: dict[tuple[str, str], int] = {}
+    numbers: list[int] = []
+    pending: list[schemas.GradeUpdateRequest] = []
+
+    for number, override in enumerate(updates, start=1):
+        key = (override.student_email, override.assignment)
+        if key in first_records:
+            errors.append(
+                schemas.GradeUpdateError(
+                    record=number,
+                    student_email=override.student_email,
+                    assignment=override.assignment,
+                    detail=f"Duplicate of record {first_records[key]}",
+                )
+            )
+            continue
+
+        first_records[key] = number
+        numbers.append(number)
+        pending.append(override)
+
+    if not pending:
+        return schemas.BulkGradeUpdateResult(updated=0, errors=errors)
+
+    submissions = models.AssignmentSubmission.__table__
+    requested = (
+        func.unnest(
+            bindparam("record_list", numbers, type_=ARRAY(Integer)),
+            bindparam(
+                "student_email_list",
+                [override.student_email for override in pending],
+                type_=ARRAY(submissions.c.student_email.type),
+            ),
+            bindparam(
+                "assignment_list",
+                [override.assignment for override in pending],
+                type_=ARRAY(submissions.c.assignment.type),
+            ),
+            bindparam(
+                "updated_score_list",
+                [override.updated_score for override in pending],
+                type_=ARRAY(submissions.c.updated_score.type),
+            ),
+        )
+        .table_valued("record", "student_email", "assignment", "updated_score")
+        .render_derived(name="requested")
+    )
+
+    # Each requested override's best submission, by the same ordering as
+    # find_best_submission_id (ties going to the earliest)
+    ranked = (
+        select(
+            submissions.c.id,
+            requested.c.record,
+            requested.c.updated_score,
+            func.row_number()
+            .over(
+                partition_by=requested.c.record,
+                order_by=(submissions.c.submitted_score.desc(), submissions.c.id),
+            )
+            .label("rank"),
+        )
+        .join_from(
+            requested,
+            submissions,
+            (submissions.c.student_email == requested.c.student_email)
+            & (submissions.c.assignment == requested.c.assignment),
+        )
+        .subquery("ranked")
+    )
+
+    stmt = (
+        update(submissions)
+        .where(submissions.c.id == ranked.c.id, ranked.c.rank == 1)
+        .values(updated_score=ranked.c.updated_score)
+        .returning(ranked.c.record)
+    )
+    applied = set((await db.execute(stmt)).scalars().all())
+    await db.commit()
+
+    for number, override in zip(numbers, pending):
+        if number not in applied:
+            errors.append(
+                schemas.GradeUpdateError(
+                    record=number,
+                    student_email=override.student_email,
+                    assignment=override.assignment,
+                    detail="No submissions found for the provided student and assignment",
+                )
+            )
+
+    errors.sort(key=lambda error: error.record)
+
+    return schemas.BulkGradeUpdateResult(updated=len(applied), errors=errors)
+
+
+async def delete_completed_assignment(
+    db: AsyncSession,
     student_email: str,
     assignment: str,
     week_number: Optional[int],
@@ -799,7 +1409,7 @@ def delete_completed_assignment(
     Delete a completed assignment from the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         student_email (str): The email of the student to delete the assignment for.
         assignment (str): The name of the assignment to delete.
         week_number (Optional[int]): The week number of the assignment to delete.
@@ -817,7 +1427,7 @@ def delete_completed_assignment(
         models.StudentsCompletedAssignments.assignment_type == assignment_type,
         models.StudentsCompletedAssignments.key_used == key_used,
     )
-    db_submission = db.execute(stmt).scalar_one_or_none()
+    db_submission = (await db.execute(stmt)).scalar_one_or_none()
 
     # Raise 500 because the ID will have come from another CRUD function
     # i.e., the request itself has already been validated
@@ -837,6 +1447,6 @@ def delete_completed_assignment(
             detail="Submission in DB does not match student email and assignment name",
         )
 
-    db.delete(db_submission)
-    db.commit()
+    await db.delete(db_submission)
+    await db.commit()
     return db_submission
@@ -6,18 +6,47 @@ in the database using SQLAlchemy and FastAPI.
 
 Functions:
     add_question_submission(
-        db: Session,
+        db: AsyncSession,
         submission: schemas.QuestionSubmission,
     ) -> models.QuestionSubmission:
         Adds a question submission to the database and associates it with an assignment.
 
     add_scoring_submission(
-        db: Session,
+        db: AsyncSession,
         submission: schemas.ScoringSubmission,
         score: Score,
     ) -> models.ScoringSubmission:
         Adds a scoring submission to the database and associates it with an assignment.
 
+    add_scoring_submissions(
+        db: AsyncSession,
+        scored: list[tuple[schemas.ScoringSubmission, Score]],
+    ) -> int:
+        Adds many scoring submissions to the database in a single transaction.
+
+    upsert_best_score(
+        db: AsyncSession,
+        submission: schemas.AssignmentSubmission,
+    ) -> None:
+        Folds an assignment submission into student_best_scores, without committing.
+
+    add_assignment_and_notebook_submissions(
+        db: AsyncSession,
+        assignment_submission: schemas.AssignmentSubmission,
+        notebook_submission: schemas.NotebookSubmission,
+    ) -> tuple[models.AssignmentSubmission, models.NotebookSubmission]:
+        Adds an assignment submission and its notebook submission in one transaction.
+
+    get_submission_context(
+        db: AsyncSession,
+        student_email: str,
+        assignment: str,
+        week_number: int,
+        assignment_type: str,
+        notebook_title: str,
+    ) -> schemas.SubmissionContext:
+        Fetches everything needed to score an assignment submission in one query.
+
 Dependencies:
     - FastAPI for HTTP exception handling and status codes.
     - SQLAlchemy for database interaction.
@@ -29,11 +58,12 @@ import datetime
 from typing import Optional, Sequence
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, or_, select
+from sqlalchemy import exists, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from . import models, schemas
+from . import models, reference_cache, schemas, token_cache
 from .live_scorer import Score
 
 #
@@ -41,7 +71,9 @@ from .live_scorer import Score
 #
 
 
-def add_notebook_submission(db: Session, submission: schemas.NotebookSubmission):
+async def add_notebook_submission(
+    db: AsyncSession, submission: schemas.NotebookSubmission
+):
     db_submission = models.NotebookSubmission(
         student_email=submission.student_email,
         notebook=submission.notebook,
@@ -57,21 +89,21 @@ def add_notebook_submission(db: Session, submission: schemas.NotebookSubmission)
     )
 
     db.add(db_submission)
-    db.commit()
-    db.refresh(db_submission)
+    await db.commit()
+    await db.refresh(db_submission)
 
     return db_submission
 
 
-def add_question_submission(
-    db: Session,
+async def add_question_submission(
+    db: AsyncSession,
     submission: schemas.QuestionSubmission,
 ):
     """
     Adds a question submission to the database.
 
     Args:
-        db (Session): The database session.
+        db (AsyncSession): The database session.
         submission (schemas.QuestionSubmission): The submission data containing student email, assignment, question, responses, and score.
 
     Raises:
@@ -83,7 +115,7 @@ def add_question_submission(
     assignment_title = f"{submission.term}_{submission.assignment}"
 
     stmt = select(models.Assignment).where(models.Assignment.title == assignment_title)
-    db_assignment = db.execute(stmt).scalar_one_or_none()
+    db_assignment = (await db.execute(stmt)).scalar_one_or_none()
     if not db_assignment:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -100,14 +132,14 @@ def add_question_submission(
     )
 
     db.add(db_submission)
-    db.commit()
-    db.refresh(db_submission)
+    await db.commit()
+    await db.refresh(db_submission)
 
     return db_submission
 
 
-def add_scoring_submission(
-    db: Session,
+async def add_scoring_submission(
+    db: AsyncSession,
     submission: schemas.ScoringSubmission,
     score: Score,
 ):
@@ -115,7 +147,7 @@ def add_scoring_submission(
     Add a scoring submission to the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         submission (schemas.ScoringSubmission): The scoring submission data.
         score (Score): The score details including max points and points earned.
 
@@ -128,7 +160,7 @@ def add_scoring_submission(
     assignment_title = f"{submission.term}_{submission.assignment}"
 
     stmt = select(models.Assignment).where(models.Assignment.title == assignment_title)
-    db_assignment = db.execute(stmt).scalar_one_or_none()
+    db_assignment = (await db.execute(stmt)).scalar_one_or_none()
     if not db_assignment:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -144,14 +176,57 @@ def add_scoring_submission(
     )
 
     db.add(db_submission)
-    db.commit()
-    db.refresh(db_submission)
+    await db.commit()
+    await db.refresh(db_submission)
 
     return db_submission
 
 
-def add_submitted_assignment_score(
-    db: Session, submission: schemas.AssignmentSubmission
+async def add_scoring_submissions(
+    db: AsyncSession,
+    scored: list[tuple[schemas.ScoringSubmission, Score]],
+) -> int:
+    """
+    Add many scoring submissions to the database in a single transaction.
+
+    Submissions whose assignment is not in the database are skipped, just as a
+    single submission would be rejected.
+
+    Args:
+        db (AsyncSession): The database session to use for the operation.
+        scored (list[tuple[schemas.ScoringSubmission, Score]]): Each submission
+            paired with its score.
+
+    Returns:
+        int: The number of submissions added.
+    """
+    titles = {f"{sub.term}_{sub.assignment}" for sub, _ in scored}
+    if not titles:
+        return 0
+
+    stmt = select(models.Assignment.title).where(models.Assignment.title.in_(titles))
+    known_titles = set((await db.execute(stmt)).scalars().all())
+
+    db_submissions = [
+        models.ScoringSubmission(
+            student_email=sub.student_email,
+            assignment=f"{sub.term}_{sub.assignment}",
+            question=sub.question,
+            max_points=score.max_points,
+            points_earned=score.points_earned,
+        )
+        for sub, score in scored
+        if f"{sub.term}_{sub.assignment}" in known_titles
+    ]
+
+    db.add_all(db_submissions)
+    await db.commit()
+
+    return len(db_submissions)
+
+
+async def add_submitted_assignment_score(
+    db: AsyncSession, submission: schemas.AssignmentSubmission
 ):
     db_submission = models.AssignmentSubmission(
         student_email=submission.student_email,
@@ -169,25 +244,100 @@ def add_submitted_assignment_score(
     )
 
     db.add(db_submission)
-    db.commit()
-    db.refresh(db_submission)
+    await upsert_best_score(db=db, submission=submission)
+    await db.commit()
+    await db.refresh(db_submission)
 
     return db_submission
 
 
+async def upsert_best_score(
+    db: AsyncSession, submission: schemas.AssignmentSubmission
+) -> None:
+    """
+    Folds an assignment submission into the student's row in student_best_scores.
+
+    Does not commit; callers run this in the same transaction as the insert into
+    assignment_submissions, so that the two tables always agree.
+
+    Args:
+        db (AsyncSession): The database session.
+        submission (schemas.AssignmentSubmission): The submission being recorded.
+    """
+    table = models.StudentBestScore.__table__
+    stmt = pg_insert(models.StudentBestScore).values(
+        student_email=submission.student_email,
+        assignment=submission.assignment,
+        week_number=submission.week_number,
+        best_score=submission.submitted_score,
+        current_max_score=submission.current_max_score,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.student_email, table.c.assignment],
+        set_={
+            "week_number": stmt.excluded.week_number,
+            "best_score": func.greatest(table.c.best_score, stmt.excluded.best_score),
+            "current_max_score": func.greatest(
+                table.c.current_max_score, stmt.excluded.current_max_score
+            ),
+            "updated": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def add_assignment_and_notebook_submissions(
+    db: AsyncSession,
+    assignment_submission: schemas.AssignmentSubmission,
+    notebook_submission: schemas.NotebookSubmission,
+) -> tuple[models.AssignmentSubmission, models.NotebookSubmission]:
+    """
+    Adds an assignment submission and the notebook submission that came with it.
+
+    Both rows are inserted with RETURNING, so no refresh is needed, and are committed
+    together with the student's best score: either all are recorded or none is.
+
+    Args:
+        db (AsyncSession): The database session.
+        assignment_submission (schemas.AssignmentSubmission): The assignment score.
+        notebook_submission (schemas.NotebookSubmission): The notebook score.
+
+    Returns:
+        tuple[models.AssignmentSubmission, models.NotebookSubmission]: The new records.
+    """
+    stmt_assignment = (
+        insert(models.AssignmentSubmission)
+        .values(**assignment_submission.model_dump())
+        .returning(models.AssignmentSubmission)
+    )
+    db_assignment_submission = (await db.execute(stmt_assignment)).scalar_one()
+
+    stmt_notebook = (
+        insert(models.NotebookSubmission)
+        .values(**notebook_submission.model_dump())
+        .returning(models.NotebookSubmission)
+    )
+    db_notebook_submission = (await db.execute(stmt_notebook)).scalar_one()
+
+    await upsert_best_score(db=db, submission=assignment_submission)
+    await db.commit()
+
+    return db_assignment_submission, db_notebook_submission
+
+
 #
 # Read
 #
 
 
-def get_assignments_by_week_and_type(
-    db: Session, week_number: int, assignment_type: str
+async def get_assignments_by_week_and_type(
+    db: AsyncSession, week_number: int, assignment_type: str
 ) -> Optional[models.Assignment]:
     """
     Retrieve assignments from the database based on week number and assignment type.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         week_number (int): The week number to filter assignments by.
         assignment_type (str): The type of assignments to retrieve.
 
@@ -198,48 +348,39 @@ def get_assignments_by_week_and_type(
         models.Assignment.week_number == week_number,
         models.Assignment.assignment_type == assignment_type,
     )
-    return db.execute(stmt).scalars().one_or_none()
+    return (await db.execute(stmt)).scalars().one_or_none()
 
 
-def get_best_score(
-    db: Session, student_email: str, assignment: str
-) -> Optional[models.AssignmentSubmission]:
+async def get_best_score(
+    db: AsyncSession, student_email: str, assignment: str
+) -> Optional[models.StudentBestScore]:
     """
     Retrieve the best score for a student on a specific assignment.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         student_email (str): The email of the student.
         assignment (str): The title of the assignment.
 
     Returns:
-        Optional[models.AssignmentSubmission]: The best assignment submission for the student,
+        Optional[models.StudentBestScore]: The student's best scores on the assignment,
         or None if no submission exists.
     """
-    # Query to get the best score (highest `submitted_score`) for the given student and assignment
-    stmt = (
-        select(models.AssignmentSubmission)
-        .where(
-            models.AssignmentSubmission.student_email == student_email,
-            models.AssignmentSubmission.assignment == assignment,
-        )
-        .order_by(models.AssignmentSubmission.submitted_score.desc())
-        .limit(1)  # Limit to 1 to explicitly fetch the best
+    stmt = select(models.StudentBestScore).where(
+        models.StudentBestScore.student_email == student_email,
+        models.StudentBestScore.assignment == assignment,
     )
+    return (await db.execute(stmt)).scalar_one_or_none()
 
-    # Execute the query and return the first result
-    result = db.execute(stmt).scalars().first()
-    return result
 
-
-def get_max_score_and_due_date_by_week_and_type(
-    db: Session, week_number: int, assignment_type: str
+async def get_max_score_and_due_date_by_week_and_type(
+    db: AsyncSession, week_number: int, assignment_type: str
 ) -> tuple[Optional[float], Optional[datetime.datetime]]:
     """
     Retrieve the maximum score and latest due date for assignments based on week number and type.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         week_number (int): The week number to filter assignments by.
         assignment_type (str): The type of assignments to retrieve.
 
@@ -247,23 +388,17 @@ def get_max_score_and_due_date_by_week_and_type(
         tuple[Optional[float], Optional[datetime.datetime]]: A tuple containing the maximum score
         and the latest due date for the matching assignments. Returns (None, None) if no match is found.
     """
-    stmt = select(
-        func.max(models.Assignment.max_score), func.max(models.Assignment.due_date)
-    ).where(
-        models.Assignment.week_number == week_number,
-        models.Assignment.assignment_type == assignment_type,
-    )
-    result = db.execute(stmt).one_or_none()
-    return (result[0], result[1]) if result else (None, None)
+    reference = await reference_cache.get_reference_data(db)
+    return reference.max_score_and_due_date(week_number, assignment_type)
 
 
-def get_all_student_grades(
-    db: Session, student_email: str
+async def get_all_student_grades(
+    db: AsyncSession, student_email: str
 ) -> Sequence[models.AssignmentSubmission]:
     """
     Retrieve all assignment submissions for a given student with error handling.
 
-    :param db: SQLAlchemy session
+    :param db: SQLAlchemy async session
     :param student_email: Email prefix of the student whose grades are to be fetched
     :return: Dictionary mapping assignments to their best scores or an empty dictionary in case of errors
     """
@@ -272,7 +407,7 @@ def get_all_student_grades(
             models.AssignmentSubmission,
         ).where(models.AssignmentSubmission.student_email == student_email)
 
-        results = db.execute(stmt).scalars().all()
+        results = (await db.execute(stmt)).scalars().all()
         return results
 
     except SQLAlchemyError as e:
@@ -289,14 +424,14 @@ def get_all_student_grades(
         )
 
 
-def get_all_student_assignments(
-    db: Session, username: str
+async def get_all_student_assignments(
+    db: AsyncSession, username: str
 ) -> Sequence[models.Assignment]:
     """
     Retrieve all assignments from the database.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
 
     Returns:
         Sequence[models.Assignment]: A sequence of Assignment objects.
@@ -306,7 +441,7 @@ def get_all_student_assignments(
             models.Assignment.student_email == username
         )
 
-        return db.execute(stmt).scalars().all()
+        return (await db.execute(stmt)).scalars().all()
     except SQLAlchemyError as e:
         # Handle database-related errors
         raise HTTPException(
@@ -321,32 +456,27 @@ def get_all_student_assignments(
         )
 
 
-def get_my_grades(db: Session, student_email: str) -> dict[str, float]:
+async def get_my_grades(db: AsyncSession, student_email: str) -> dict[str, float]:
     """
     Retrieve the best score for each assignment for a given student
 
-    :param db: SQLAlchemy session
+    :param db: SQLAlchemy async session
     :param student_email: Email prefix of the student whose grades are to be fetched
     :return: Dictionary mapping assignments to their best scores
     """
 
-    stmt = (
-        select(
-            models.AssignmentSubmission.assignment,
-            func.max(models.AssignmentSubmission.submitted_score).label("best_score"),
-        )
-        .where(models.AssignmentSubmission.student_email == student_email)
-        .group_by(models.AssignmentSubmission.assignment)
-    )
+    stmt = select(
+        models.StudentBestScore.assignment, models.StudentBestScore.best_score
+    ).where(models.StudentBestScore.student_email == student_email)
 
-    best_scores = db.execute(stmt).all()
+    best_scores = (await db.execute(stmt)).all()
     return {assignment: best_score for assignment, best_score in best_scores}
 
 
-def get_my_grades_testing(db: Session, student_email: str):
+async def get_my_grades_testing(db: AsyncSession, student_email: str):
     """
     Retrieve the best score for each assignment for a given student
-    :param db: SQLAlchemy session
+    :param db: SQLAlchemy async session
     :param student_email: Email prefix of the student whose grades are to be fetched
     :return: Dictionary mapping assignments to their best scores
     """
@@ -355,7 +485,7 @@ def get_my_grades_testing(db: Session, student_email: str):
     # assignments_ = crud_admin.get_assignments(db)
 
     stmt = select(models.Assignment)
-    assignments_ = db.execute(stmt).scalars().all()
+    assignments_ = (await db.execute(stmt)).scalars().all()
 
     # try:
     #     assignment_JSON = jsonable_encoder(assignments_)
@@ -366,7 +496,9 @@ def get_my_grades_testing(db: Session, student_email: str):
     #     return {}
 
     # get all assignment submissions
-    student_submissions_ = get_all_student_grades(db=db, student_email=student_email)
+    student_submissions_ = await get_all_student_grades(
+        db=db, student_email=student_email
+    )
 
     return assignments_, student_submissions_
     # try:
@@ -380,65 +512,152 @@ def get_my_grades_testing(db: Session, student_email: str):
     # return assignment_JSON, student_submissions_JSON
 
 
-def get_notebook_by_title(db: Session, title: str) -> Optional[models.Notebook]:
+async def get_notebook_by_title(
+    db: AsyncSession, title: str
+) -> Optional[models.Notebook]:
     """
     Retrieve a notebook from the database by its title.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         title (str): The title of the notebook to retrieve.
 
     Returns:
         Optional[models.Notebook]: The notebook object if found, otherwise None.
     """
     stmt = select(models.Notebook).where(models.Notebook.title == title)
-    return db.execute(stmt).scalar_one_or_none()
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
-def get_notebook_max_score_by_notebook(
-    db: Session, notebook_title: str
+async def get_notebook_max_score_by_notebook(
+    db: AsyncSession, notebook_title: str
 ) -> Optional[float]:
     """
     Retrieve the maximum score for a notebook based on the notebook title.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         notebook (str): The title of the notebook to retrieve the maximum score for.
 
     Returns:
         Optional[float]: The maximum score for the notebook if found, otherwise None.
     """
-    stmt = select(models.Notebook.max_score).where(
-        models.Notebook.title == notebook_title,
+    reference = await reference_cache.get_reference_data(db)
+    return reference.notebook_max_score(notebook_title)
+
+
+async def get_submission_context(
+    db: AsyncSession,
+    student_email: str,
+    assignment: str,
+    week_number: int,
+    assignment_type: str,
+    notebook_title: str,
+) -> schemas.SubmissionContext:
+    """
+    Retrieve everything needed to score an assignment submission.
+
+    This combines check_completed_assignment,
+    get_max_score_and_due_date_by_week_and_type, get_notebook_max_score_by_notebook,
+    and get_best_score. Assignment and notebook metadata come from the reference
+    cache; the student's completion status and best score take a single query.
+
+    Args:
+        db (AsyncSession): The database session to use for the query.
+        student_email (str): The email of the student.
+        assignment (str): The title of the assignment.
+        week_number (int): The week number of the assignment.
+        assignment_type (str): The type of the assignment.
+        notebook_title (str): The title of the notebook being submitted.
+
+    Returns:
+        schemas.SubmissionContext: Whether the student has already completed the
+        assignment, the assignment's max score and due date, the notebook's max score,
+        and the student's current best score (each None if not found).
+    """
+    reference = await reference_cache.get_reference_data(db)
+    max_score, due_date = reference.max_score_and_due_date(week_number, assignment_type)
+
+    already_completed = exists().where(
+        models.StudentsCompletedAssignments.student_email == student_email,
+        models.StudentsCompletedAssignments.assignment_type == assignment_type,
+        models.StudentsCompletedAssignments.week_number == week_number,
+    )
+
+    current_best = (
+        select(models.StudentBestScore.current_max_score)
+        .where(
+            models.StudentBestScore.student_email == student_email,
+            models.StudentBestScore.assignment == assignment,
+        )
+        .scalar_subquery()
+    )
+
+    row = (await db.execute(select(already_completed, current_best))).one()
+
+    return schemas.SubmissionContext(
+        already_completed=row[0],
+        assignment_max_score=max_score,
+        assignment_due_date=due_date,
+        notebook_max_score=reference.notebook_max_score(notebook_title),
+        current_best=row[1],
     )
-    return db.execute(stmt).scalar_one_or_none()
 
 
-def get_token_expiry(db: Session, value: str) -> str:
-    stmt = select(models.Token).where(models.Token.value == value)
-    db_token = db.execute(stmt).scalar_one_or_none()
+async def get_token_expiry(db: AsyncSession, value: str) -> str:
+    token = await token_cache.get_token(db, value)
 
-    if not db_token:
+    if not token:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Token not found"
         )
 
-    if db_token.expires < datetime.datetime.now(datetime.UTC):
+    if token.is_expired():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Token has expired"
         )
 
-    return db_token.expires.isoformat()
+    return token.expires.isoformat()
+
+
+async def validate_token(
+    db: AsyncSession,
+    value: str,
+    student_id: Optional[str] = None,
+    assignment: Optional[str] = None,
+) -> str:
+    """
+    Runs the checks of get_token_expiry and then validate_token_filters, with a single
+    (cached) lookup.
+
+    Args:
+        db (AsyncSession): The database session to use, on a cache miss.
+        value (str): The token's value.
+        student_id (Optional[str]): The student the token must be valid for.
+        assignment (Optional[str]): The assignment the token must be valid for.
+
+    Returns:
+        str: The token's expiry, in ISO format.
+
+    Raises:
+        HTTPException (404): If there is no such token, or it isn't valid for the
+            student or assignment.
+        HTTPException (400): If the token has expired.
+    """
+    expiry = await get_token_expiry(db, value)  # Caches the token, if found
+    await validate_token_filters(db, value, student_id, assignment)
+
+    return expiry
 
 
-def check_completed_assignment(
-    db: Session, student_id: str, assignment_type: str, week_number: int
+async def check_completed_assignment(
+    db: AsyncSession, student_id: str, assignment_type: str, week_number: int
 ):
     """
     Check if the student has already completed the assignment.
 
     Args:
-        db (Session): The database session to use for the query.
+        db (AsyncSession): The database session to use for the query.
         student_id (str): The ID of the student.
         assignment_type (str): The assignment type to check.
         week_number (int): The week number to check.
@@ -481,7 +700,7 @@ def check_completed_assignment(
         stmt_check = select(models.StudentsCompletedAssignments).where(*conditions)
 
         # executes the statement and returns the first result
-        completed_assignment = db.execute(stmt_check).scalar_one_or_none()
+        completed_assignment = (await db.execute(stmt_check)).scalar_one_or_none()
 
         if completed_assignment:
             raise HTTPException(
@@ -490,36 +709,26 @@ def check_completed_assignment(
             )
 
 
-def validate_token_filters(
-    db: Session,
+async def validate_token_filters(
+    db: AsyncSession,
     value: str,
     student_id: Optional[str] = None,
     assignment: Optional[str] = None,
 ) -> str:
-    stmt = select(models.Token).where(models.Token.value == value)
-
-    stmt = stmt.where(
-        or_(models.Token.student_id == student_id, models.Token.student_id.is_(None))
-    )
-
-    stmt = stmt.where(
-        or_(models.Token.assignment == assignment, models.Token.assignment.is_(None))
-    )
-
-    db_token = db.execute(stmt).scalar_one_or_none()
+    token = await token_cache.get_token(db, value)
 
-    if not db_token:
+    if not token or not token.matches(student_id, assignment):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Token not found, for token: {value}, student id: {student_id}, assignment: {assignment}",
         )
 
-    if db_token.expires < datetime.datetime.now(datetime.UTC):
+    if token.is_expired():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Token has expired"
         )
 
-    return db_token.expires.isoformat()
+    return token.expires.isoformat()
 
 
 #
@@ -527,13 +736,13 @@ def validate_token_filters(
 #
 
 
-def add_execution_log(
-    db: Session, log: schemas.ExecutionLogUpload
+async def add_execution_log(
+    db: AsyncSession, log: schemas.ExecutionLogUpload
 ) -> datetime.datetime:
     """
     Inserts a new code execution log into the database
 
-    :param db: SQLAlchemy Session instance
+    :param db: SQLAlchemy AsyncSession instance
     :param log: ExecutionLogUpload object containing log content and details
     :return: Upload timestamp of the created ExecutionLog
     """
@@ -546,24 +755,24 @@ def add_execution_log(
         )
 
         db.add(db_log)
-        db.commit()
-        db.refresh(db_log)
+        await db.commit()
+        await db.refresh(db_log)
 
         return db_log.upload_time
 
     except SQLAlchemyError as err:
-        db.rollback()
+        await db.rollback()
         raise err
 
 
-def students_completed_assignments(
-    db: Session, StudentsCompletedAssignments: schemas.StudentsCompletedAssignments
+async def students_completed_assignments(
+    db: AsyncSession, StudentsCompletedAssignments: schemas.StudentsCompletedAssignments
 ) -> models.StudentsCompletedAssignments:
     """
     Create a new token and store it in the database.
 
     Args:
-        db (Session): The database session to use for the operation.
+        db (AsyncSession): The database session to use for the operation.
         token_req (schemas.TokenRequest): The token request containing the value and duration for the token.
 
     Returns:
@@ -571,7 +780,7 @@ def students_completed_assignments(
     """
 
     if StudentsCompletedAssignments.key_used is not None:
-        validate_token_filters(
+        await validate_token_filters(
             db=db,
             value=StudentsCompletedAssignments.key_used,
             assignment=f"{StudentsCompletedAssignments.assignment}-submission",
@@ -587,7 +796,7 @@ def students_completed_assignments(
     )
 
     db.add(db_completed_assignments)
-    db.commit()
-    db.refresh(db_completed_assignments)
+    await db.commit()
+    await db.refresh(db_completed_assignments)
 
     return db_completed_assignments
@@ -1,15 +1,139 @@
 import os
+import threading
+import time
+from dataclasses import dataclass
 
 from dotenv import load_dotenv
 from sqlalchemy import JSON, create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 load_dotenv()  # Meaningless in prod
 db_url = os.getenv("DATABASE_URL") or ""  # Just to ensure str type
 db_url = db_url.replace("postgres://", "postgresql://")  # For SQLAlchemy
 
+# The app itself talks to the database through psycopg 3 in async mode, so that
+# handlers await I/O rather than blocking the event loop
+async_db_url = db_url.replace("postgresql://", "postgresql+psycopg://")
+
+#
+# Pool settings (apply to the app's async engine only)
+#
+
+# Per replica, so the cluster sees replicas * (size + overflow) at most
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or 5)
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW") or 10)
+# Seconds to wait for a free connection before giving up
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT") or 30)
+# Seconds after which a connection is replaced; -1 disables
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE") or 1800)
+# Test connections on checkout, so that a failover doesn't surface as errors
+DB_POOL_PRE_PING = (os.getenv("DB_POOL_PRE_PING") or "true").lower() != "false"
+# Server-side limit on any single statement, in milliseconds; 0 disables
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS") or 30000)
+
+
+@dataclass
+class PoolStats:
+    """
+    A snapshot of the async engine's connection pool.
+
+    Attributes:
+        size (int): The number of connections kept open.
+        max_overflow (int): The number of extra connections allowed under load.
+        checked_out (int): Connections currently in use.
+        checked_in (int): Idle connections in the pool.
+        overflow (int): Connections open beyond size (negative while filling up).
+        checkouts (int): Connections handed out since startup.
+        timeouts (int): Checkouts that gave up after DB_POOL_TIMEOUT.
+        total_wait_seconds (float): Time spent waiting for connections, including
+            time spent opening new ones.
+        max_wait_seconds (float): Longest wait for a connection.
+    """
+
+    size: int
+    max_overflow: int
+    checked_out: int = 0
+    checked_in: int = 0
+    overflow: int = 0
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+_pool_stats = PoolStats(size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+_pool_stats_lock = threading.Lock()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waits.
+    """
+
+    def _do_get(self):
+        start = time.monotonic()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            with _pool_stats_lock:
+                _pool_stats.timeouts += 1
+            raise
+
+        waited = time.monotonic() - start
+        with _pool_stats_lock:
+            _pool_stats.checkouts += 1
+            _pool_stats.total_wait_seconds += waited
+            _pool_stats.max_wait_seconds = max(_pool_stats.max_wait_seconds, waited)
+
+        return conn
+
+
+# Sync engine, kept for alembic and one-off scripts
 engine = create_engine(db_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Objects are not expired on commit, since lazy-loading expired attributes is not
+# possible outside of an await
+async_engine = create_async_engine(
+    async_db_url,
+    poolclass=TimedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args=(
+        {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+        if DB_STATEMENT_TIMEOUT_MS > 0
+        else {}
+    ),
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base(type_annotation_map={dict: JSON})
+
+
+def get_pool_stats() -> PoolStats:
+    """
+    Returns a snapshot of the async engine's connection pool.
+
+    Returns:
+        PoolStats: Live pool counts, plus wait counters since startup.
+    """
+    pool = async_engine.pool
+    assert isinstance(pool, TimedQueuePool)
+
+    with _pool_stats_lock:
+        stats = PoolStats(**vars(_pool_stats))
+
+    stats.checked_out = pool.checkedout()
+    stats.checked_in = pool.checkedin()
+    stats.overflow = pool.overflow()
+
+    return stats
@@ -0,0 +1,164 @@
+"""
+invalidation.py
+
+This module provides a cache invalidation bus between API replicas, over Postgres
+LISTEN/NOTIFY. Writers publish a topic (e.g., "reference" after an assignment changes)
+in the same transaction as their write; every other replica's listener receives it once
+the transaction commits, and runs the handlers subscribed to that topic.
+
+A replica does not handle its own messages: the writer is expected to evict its own
+caches directly, after committing. When the listener (re)connects, every handler is
+run, since messages sent while it was disconnected are lost.
+
+Functions:
+    - subscribe(topic: str, handler: Handler) -> None:
+        Registers a handler to run when a topic is published by another replica.
+
+    - publish(db: AsyncSession, topic: str, key: Optional[str] = None) -> None:
+        Queues a message, to be sent when the session's transaction commits.
+
+    - listen() -> None:
+        Listens for messages from other replicas until cancelled.
+
+Environment Variables:
+- INVALIDATION_CHANNEL: The Postgres channel to use (default "engr_131_invalidation").
+- INVALIDATION_LISTEN: Set to "false" to not start the listener (default "true").
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .db import db_url
+
+#
+# Environment variables
+#
+
+INVALIDATION_CHANNEL = os.getenv("INVALIDATION_CHANNEL") or "engr_131_invalidation"
+INVALIDATION_LISTEN = (os.getenv("INVALIDATION_LISTEN") or "true").lower() != "false"
+
+#
+# Types
+#
+
+# Called with the message's key (None meaning "everything"); may be async
+Handler = Callable[[Optional[str]], Any]
+
+#
+# State
+#
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process, so that it can skip its own messages
+ORIGIN = uuid.uuid4().hex
+
+_handlers: dict[str, list[Handler]] = defaultdict(list)
+
+#
+# Functions
+#
+
+
+def subscribe(topic: str, handler: Handler) -> None:
+    """
+    Registers a handler to run when another replica publishes a topic.
+
+    Args:
+        topic (str): The topic, e.g., "reference".
+        handler (Handler): Called with the message's key, or None to evict everything.
+    """
+    _handlers[topic].append(handler)
+
+
+async def publish(db: AsyncSession, topic: str, key: Optional[str] = None) -> None:
+    """
+    Queues an invalidation message on the session's transaction.
+
+    Postgres holds NOTIFY messages until commit (and drops them on rollback), so other
+    replicas never evict before the write is visible to them.
+
+    Args:
+        db (AsyncSession): The session making the write.
+        topic (str): The topic, e.g., "reference".
+        key (Optional[str]): What changed within the topic; None for everything.
+    """
+    payload = json.dumps({"origin": ORIGIN, "topic": topic, "key": key})
+    await db.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+
+
+async def _run(handler: Handler, key: Optional[str]) -> None:
+    try:
+        result = handler(key)
+        if inspect.isawaitable(result):
+            await result
+    except Exception:
+        # Handlers are arbitrary cache code; one failing mustn't stop the others
+        logger.exception("Invalidation handler failed")
+
+
+async def _dispatch(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        message = None
+
+    # Valid JSON that isn't an object (e.g. "1") is just as unusable as invalid JSON
+    if not isinstance(message, dict):
+        logger.warning("Ignoring malformed invalidation message: %s", payload)
+        return
+
+    if message.get("origin") == ORIGIN:
+        return
+
+    for handler in _handlers.get(message.get("topic"), []):
+        await _run(handler, message.get("key"))
+
+
+async def _dispatch_all() -> None:
+    for handlers in list(_handlers.values()):
+        for handler in handlers:
+            await _run(handler, None)
+
+
+async def listen() -> None:
+    """
+    Listens for invalidation messages from other replicas until cancelled,
+    reconnecting (with backoff) whenever the connection drops or can't be made.
+    """
+    backoff = 1.0
+    connected_before = False
+
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                db_url, autocommit=True
+            ) as conn:
+                await conn.execute(
+                    sql.SQL("LISTEN {}").format(sql.Identifier(INVALIDATION_CHANNEL))
+                )
+
+                # Anything may have changed while we weren't listening
+                if connected_before:
+                    await _dispatch_all()
+                connected_before = True
+                backoff = 1.0
+
+                async for notify in conn.notifies():
+                    await _dispatch(notify.payload)
+        except psycopg.OperationalError:
+            logger.exception("Invalidation listener disconnected")
+
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 30.0)
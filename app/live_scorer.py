@@ -6,26 +6,46 @@ calculating scores for assignments, and handling responses for academic question
 
 Classes:
     - Score: A data class to represent the maximum points and earned points for a question or assignment.
+    - PreparedQuestion: A question's solution keys, points and canonicalized answers.
+    - SolutionRegistry: Every solution module, and every prepared question, by path.
 
 Functions:
+    - build_registry() -> SolutionRegistry:
+        Imports every module under app.solutions and prepares each question.
+
+    - reload_registry() -> ReloadResult:
+        Builds a fresh registry from the files on disk and swaps it in atomically.
+
+    - watch_solutions(interval: float) -> None:
+        Polls the solutions directory and reloads the registry when it changes.
+
     - load_module(path: str) -> Optional[ModuleType]:
-        Dynamically loads a Python module based on the provided path.
+        Looks up a solution module, by the provided path, in the registry.
 
     - calculate_score(term: str, assignment: str, question: str, responses: dict) -> Score | str:
         Calculates the score for a given question based on the provided responses.
 
 Dependencies:
-    - importlib: For dynamic module importing.
+    - importlib, pathlib: For dynamic module discovery and importing.
     - dataclasses: To define the Score class.
     - types.ModuleType: For type hinting loaded modules.
     - typing.Optional: To handle optional return types.
 """
 
+import asyncio
 import importlib
-from dataclasses import dataclass
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
 from types import ModuleType
 from typing import Any, Optional
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Score:
@@ -41,9 +61,231 @@ class Score:
     points_earned: float
 
 
+@dataclass(frozen=True)
+class PreparedQuestion:
+    """
+    A question module's solutions, ready for scoring without further lookups.
+
+    Attributes:
+        keys (tuple[str, ...]): The solution keys, in order.
+        points (tuple[float, ...]): The points for each key.
+        answers (tuple[Any, ...]): The expected answer for each key.
+        sorted_answers (tuple[Optional[list], ...]): Each answer sorted once up front,
+            for order-insensitive comparison of list responses; None if unsortable.
+    """
+
+    keys: tuple[str, ...]
+    points: tuple[float, ...]
+    answers: tuple[Any, ...]
+    sorted_answers: tuple[Optional[list], ...]
+
+
+@dataclass
+class SolutionRegistry:
+    """
+    Every module under app.solutions, and every question prepared for scoring.
+
+    Attributes:
+        modules (dict[str, ModuleType]): Modules keyed by relative path
+            (e.g., ".solutions.winter_2025.week_6").
+        questions (dict[tuple[str, str, str, str], PreparedQuestion | str]): Prepared
+            questions keyed by (term, week, assignment, question), or an error message
+            if the module does not define solutions and points.
+    """
+
+    modules: dict[str, ModuleType] = field(default_factory=dict)
+    questions: dict[tuple[str, str, str, str], PreparedQuestion | str] = field(
+        default_factory=dict
+    )
+
+
+def _sorted_or_none(answer: Any) -> Optional[list]:
+    try:
+        return sorted(answer)
+    except TypeError:
+        return None
+
+
+def prepare_question(module: ModuleType) -> PreparedQuestion | str:
+    """
+    Prepares a question module for scoring.
+
+    Args:
+        module (ModuleType): A module defining `solutions` and `total_points`.
+
+    Returns:
+        PreparedQuestion: The prepared question.
+        str: An error message if the module lacks solutions or points.
+    """
+    try:
+        solutions: dict[str, Any] = module.solutions
+        points: list[float] = module.total_points
+    except AttributeError:
+        return "Error fetching solution"
+
+    answers = tuple(solutions.values())
+
+    return PreparedQuestion(
+        keys=tuple(solutions.keys()),
+        points=tuple(points),
+        answers=answers,
+        sorted_answers=tuple(_sorted_or_none(answer) for answer in answers),
+    )
+
+
+def build_registry() -> SolutionRegistry:
+    """
+    Imports every module under app.solutions and prepares each question.
+
+    The directory tree is walked directly, rather than via pkgutil, so that
+    directories without an __init__.py (namespace packages) are included, as they
+    would be by importlib.
+
+    Modules that raise while being imported or prepared are skipped and logged.
+
+    Returns:
+        SolutionRegistry: The populated registry.
+    """
+    registry = SolutionRegistry()
+
+    root = importlib.import_module(".solutions", package="app")
+    registry.modules[".solutions"] = root
+    root_dir = _solutions_dir()
+
+    for file in sorted(root_dir.rglob("*")):
+        if file.name.startswith("__") or "__pycache__" in file.parts:
+            continue
+        if file.is_file() and file.suffix != ".py":
+            continue
+
+        rel_parts = file.relative_to(root_dir).with_suffix("").parts
+        path = ".solutions." + ".".join(rel_parts)
+
+        # Solution files run arbitrary code on import; a broken one only fails its
+        # own questions, which are then scored as missing
+        try:
+            module = importlib.import_module(path, package="app")
+            prepared = None
+            if len(rel_parts) == 4 and file.is_file():
+                prepared = prepare_question(module)
+        except Exception:
+            logger.exception("Failed to load solution module %s", path)
+            continue
+
+        registry.modules[path] = module
+
+        # i.e., .solutions.<term>.<week>.<assignment>.<question>
+        if prepared is not None:
+            term, week, assignment, question = rel_parts
+            registry.questions[(term, week, assignment, question)] = prepared
+
+    return registry
+
+
+def _solutions_dir() -> Path:
+    root = importlib.import_module(".solutions", package="app")
+    return Path(next(iter(root.__path__)))
+
+
+def _solutions_fingerprint() -> tuple[int, float]:
+    # The number of source files and the latest modification time among them (and
+    # their directories, so that deletions are noticed too)
+    count = 0
+    latest = 0.0
+    for entry in _solutions_dir().rglob("*"):
+        if entry.suffix == ".py" or entry.is_dir():
+            try:
+                mtime = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue  # Deleted since the walk listed it; the next check sees why
+            count += 1
+            latest = max(latest, mtime)
+    return count, latest
+
+
+# Seconds between checks for changed solution files; 0 (the default) disables watching
+SOLUTIONS_WATCH_INTERVAL = float(os.getenv("SOLUTIONS_WATCH_INTERVAL") or 0)
+
+# Replaced wholesale, never mutated, so readers always see a complete registry
+registry: SolutionRegistry = build_registry()
+_fingerprint: tuple[int, float] = _solutions_fingerprint()
+_reload_lock = threading.Lock()
+
+
+@dataclass
+class ReloadResult:
+    """
+    The outcome of a registry reload.
+
+    Attributes:
+        modules (int): The number of modules in the new registry.
+        questions (int): The number of prepared questions in the new registry.
+        seconds (float): How long the rebuild took.
+    """
+
+    modules: int
+    questions: int
+    seconds: float
+
+
+def reload_registry() -> ReloadResult:
+    """
+    Builds a fresh registry from the solution files on disk and swaps it in.
+
+    Solution modules are dropped from sys.modules first, so that new and changed files
+    are imported afresh. The registry in use keeps its own references to the old module
+    objects, and scoring keeps using it until the single assignment that replaces it.
+    Concurrent reloads are serialized.
+
+    Returns:
+        ReloadResult: Counts for the new registry and the time taken to build it.
+    """
+    global registry, _fingerprint
+
+    with _reload_lock:
+        start = time.perf_counter()
+        fingerprint = _solutions_fingerprint()
+
+        for name in [m for m in sys.modules if m.startswith("app.solutions.")]:
+            del sys.modules[name]
+        importlib.invalidate_caches()
+
+        new_registry = build_registry()
+
+        registry = new_registry
+        _fingerprint = fingerprint
+
+        return ReloadResult(
+            modules=len(new_registry.modules),
+            questions=len(new_registry.questions),
+            seconds=time.perf_counter() - start,
+        )
+
+
+async def watch_solutions(interval: float) -> None:
+    """
+    Polls the solutions directory every `interval` seconds and reloads the registry,
+    off the event loop, whenever files are added, removed or modified.
+
+    Args:
+        interval (float): Seconds between checks.
+    """
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            changed = await asyncio.to_thread(_solutions_fingerprint) != _fingerprint
+            if changed:
+                result = await asyncio.to_thread(reload_registry)
+                logger.info("Reloaded solution registry: %s", result)
+        except Exception:
+            # Keep watching; the registry in use is untouched by a failed rebuild
+            logger.exception("Failed to reload solution registry")
+
+
 def load_module(path: str) -> Optional[ModuleType]:
     """
-    Dynamically loads a Python module based on the provided path.
+    Looks up a solution module, by the provided path, in the registry.
 
     Args:
         path (str): The module path to load (e.g., ".solutions.Fall_2024.assignment1").
@@ -51,9 +293,6 @@ def load_module(path: str) -> Optional[ModuleType]:
     Returns:
         Optional[ModuleType]: The loaded module object if found, otherwise None.
 
-    Exceptions:
-        - Catches ModuleNotFoundError and returns None if the module is not found.
-
     Example Usage:
         >>> module = load_module(".solutions.Fall_2024.assignment1")
         >>> if module:
@@ -61,12 +300,7 @@ def load_module(path: str) -> Optional[ModuleType]:
         ... else:
         ...     print("Module not found")
     """
-    try:
-        # Attempt to import the module dynamically
-        return importlib.import_module(path, package="app")
-    except ModuleNotFoundError:
-        # Return None if the module does not exist
-        return None
+    return registry.modules.get(path)
 
 
 def calculate_score(
@@ -108,41 +342,43 @@ def calculate_score(
             )
         Score(max_points=10, points_earned=8)
     """
-    term_module = load_module(f".solutions.{term}")
-    if not term_module:
-        return f"Invalid term: {term}"
-
-    week_module = load_module(f".solutions.{term}.{week}")
-    if not week_module:
-        return f"Invalid week: {week}"
+    # Take one reference, in case a reload swaps the registry mid-call
+    current = registry
+    prepared = current.questions.get((term, week, assignment, question))
 
-    assignment_module = load_module(f".solutions.{term}.{week}.{assignment}")
-    if not assignment_module:
-        return f"Invalid assignment: {assignment}"
-
-    question_module = load_module(f".solutions.{term}.{week}.{assignment}.{question}")
-    if not question_module:
+    if prepared is None:
+        if f".solutions.{term}" not in current.modules:
+            return f"Invalid term: {term}"
+        if f".solutions.{term}.{week}" not in current.modules:
+            return f"Invalid week: {week}"
+        if f".solutions.{term}.{week}.{assignment}" not in current.modules:
+            return f"Invalid assignment: {assignment}"
         return f"Invalid question: {question}"
 
-    try:
-        solutions: dict[str, Any] = question_module.solutions
-        points: list[float] = question_module.total_points
-    except AttributeError:
-        return "Error fetching solution"
+    if isinstance(prepared, str):
+        return prepared
 
     scores = {}
 
-    for i, (k, v) in enumerate(solutions.items()):
+    for k, v, sorted_v, p in zip(
+        prepared.keys, prepared.answers, prepared.sorted_answers, prepared.points
+    ):
         if k not in responses:
             # return "Incomplete submission"
             continue  # TODO: Revisit this logic
 
-        if responses[k] == v:
-            scores[k] = (points[i], points[i])
-        elif isinstance(responses[k], list) and sorted(responses[k]) == sorted(v):
+        response = responses[k]
+
+        if response == v:
+            scores[k] = (p, p)
+        elif (
+            isinstance(response, list)
+            and sorted_v is not None
+            and sorted(response) == sorted_v
+        ):
             print("Found correct list response out of order")
-            scores[k] = (points[i], points[i])
+            scores[k] = (p, p)
         else:
-            scores[k] = (0, points[i])
+            scores[k] = (0, p)
 
     return scores
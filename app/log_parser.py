@@ -1,6 +1,7 @@
 import base64
+import re
 from dataclasses import dataclass, field
-from typing import Any, Optional, TypedDict
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, TypedDict
 
 from nacl.public import Box
 
@@ -14,6 +15,97 @@ class LogParserResults(TypedDict):
     assignment_scores: dict[str, Any]
 
 
+_NON_DIGITS = re.compile(r"\D")
+
+
+def timestamp_key(timestamp: str) -> int:
+    """
+    Converts a log timestamp to an integer that orders the same way, by keeping only
+    its digits (e.g., "2024-12-27 19:40:10" -> 20241227194010).
+    """
+    # Fast path for the usual "YYYY-MM-DD HH:MM:SS" format
+    digits = timestamp.replace("-", "").replace(":", "").replace(" ", "")
+    if not digits.isdigit():
+        digits = _NON_DIGITS.sub("", digits)
+    return int(digits) if digits else 0
+
+
+@dataclass(slots=True)
+class QuestionRecord:
+    """
+    The most recent entry for a question, as tracked by LogParser.
+
+    Scores are left as text while the log is read, and converted only for notebooks
+    that are kept, so that lines of other notebooks (or of no notebook at all) are
+    never parsed as numbers.
+
+    Attributes:
+        fields (list[str]): The entry's log line, split on commas.
+        timestamp (int): The entry's timestamp, as returned by timestamp_key.
+        timestamp_text (str): The entry's timestamp as it appeared in the log.
+        last_index (int): Index of the last log line for the question.
+        score_earned (float): Points earned on the question, set by parse_logs.
+        score_possible (float): Points possible on the question, set by parse_logs.
+    """
+
+    fields: list[str]
+    timestamp: int
+    timestamp_text: str
+    last_index: int
+    score_earned: float = 0.0
+    score_possible: float = 0.0
+
+    def convert_scores(self) -> None:
+        """
+        Sets score_earned and score_possible from the entry's fields.
+        """
+        parts = self.fields
+        self.score_earned = float(parts[2].strip()) if len(parts) > 2 else 0.0
+        self.score_possible = float(parts[3].strip()) if len(parts) > 3 else 0.0
+
+
+@dataclass(slots=True)
+class NotebookRecord:
+    """
+    Everything LogParser has gathered about one notebook.
+
+    Header fields come from the most recent "total-points" line for the notebook, and
+    entry fields from its question lines. An index of -1 means no such line was seen.
+
+    Attributes:
+        header_index (int): Index of the last header line.
+        header_timestamp (int): Timestamp of the most recent header.
+        header_timestamp_text (str): The same, as it appeared in the log.
+        max_points (Optional[float]): Total points from the most recent header.
+        entry_index (int): Index of the last question line.
+        entry_timestamp (int): Timestamp of the most recent question line.
+        entry_timestamp_text (str): The same, as it appeared in the log.
+        questions (dict[str, QuestionRecord]): The most recent entry per question.
+        total_score (float): Sum of score_earned, set by calculate_total_scores.
+    """
+
+    header_index: int = -1
+    header_timestamp: int = 0
+    header_timestamp_text: str = ""
+    max_points: Optional[float] = None
+    entry_index: int = -1
+    entry_timestamp: int = 0
+    entry_timestamp_text: str = ""
+    questions: dict[str, QuestionRecord] = field(default_factory=dict)
+    total_score: float = 0.0
+
+    @property
+    def latest_timestamp(self) -> str:
+        """
+        The most recent timestamp across the header and question lines.
+        """
+        if self.header_index < 0:
+            return self.entry_timestamp_text
+        if self.entry_index < 0 or self.header_timestamp >= self.entry_timestamp:
+            return self.header_timestamp_text
+        return self.entry_timestamp_text
+
+
 @dataclass
 class LogParser:
     """
@@ -21,50 +113,70 @@ class LogParser:
     Handles both assignment info and question-level details.
     """
 
-    log_lines: list[str]
+    log_lines: Iterable[str]
     week_tag: Optional[str] = None
     student_info: dict[str, str] = field(default_factory=dict)
-    assignments: dict[str, dict] = field(default_factory=dict)
+    assignments: dict[str, NotebookRecord] = field(default_factory=dict)
 
     def parse_logs(self) -> None:
         """
         Main method to parse logs and populate student_info and assignments.
+
+        Makes a single pass over log_lines, which may be any iterable (e.g., a
+        generator of decrypted lines). Each line is split once, and dispatched on its
+        tag column: "Student Info", "total-points" (notebook headers), or a notebook
+        name (question entries). Headers and entries are aggregated per notebook name
+        as they arrive, keeping the most recent by timestamp; once every line has been
+        seen, only the notebooks named on lines mentioning week_tag are kept.
         """
-        unique_students: set[str] = set()
+        all_questions: dict[str, None] = {}  # Insertion-ordered set
+        student_names: dict[str, int] = {}  # Name -> index of last line
+        student_fields: Optional[list[str]] = None
+        notebooks: dict[str, NotebookRecord] = {}
 
-        self._find_all_questions()
+        week_tag = self.week_tag
 
-        for line in reversed(
-            self.log_lines
-        ):  # Process in reverse to get the most recent entries first
+        for index, line in enumerate(self.log_lines):
             if self._is_student_info(line):
-                self._process_student_info(line, unique_students)
-            elif (
-                any(item in line for item in self.all_questions)
-                and "total-points" in line
-            ):
-                self._process_assignment_header(line)
-
-        # process assignment entries after all headers have been processed
-        for line in reversed(self.log_lines):
-            if (
-                any(item in line for item in self.all_questions)
-                and "total-points" not in line
-            ):
-                self._process_assignment_entry(line)
-
-    def _find_all_questions(self) -> None:
-        """
-        Finds all questions in the log_lines and returns a list of them.
-        """
-        questions = []
-        for line in self.log_lines:
-            if self.week_tag and self.week_tag in line:
-                parts = line.split(",")
-                question_tag = parts[3].strip()
-                if question_tag not in questions:
-                    questions.append(question_tag)
-        self.all_questions = questions
+                student_fields = line.split(", ")
+                student_names[student_fields[2].strip()] = index
+                continue
+
+            parts = line.split(",")
+
+            if week_tag and week_tag in line and len(parts) > 3:
+                all_questions.setdefault(parts[3].strip(), None)
+
+            if "total-points" in line:
+                if parts[0].strip().startswith("total-points") and len(parts) > 3:
+                    self._process_assignment_header(notebooks, index, parts)
+                continue
+
+            if len(parts) >= 2:
+                self._process_assignment_entry(notebooks, index, parts)
+
+        self.all_questions = list(all_questions)
+
+        self._process_student_info(student_names, student_fields)
+
+        # Notebooks with a header come first; within each group, notebooks (and their
+        # questions) are ordered most recent first, by last appearance
+        kept = [notebook for notebook in notebooks if notebook in all_questions]
+        kept.sort(key=lambda notebook: notebooks[notebook].entry_index, reverse=True)
+        kept.sort(key=lambda notebook: notebooks[notebook].header_index, reverse=True)
+
+        for notebook_name in kept:
+            record = notebooks[notebook_name]
+            for question in record.questions.values():
+                question.convert_scores()
+            record.questions = dict(
+                sorted(
+                    record.questions.items(),
+                    key=lambda item: item[1].last_index,
+                    reverse=True,
+                )
+            )
+            self.assignments[notebook_name] = record
 
     def _is_student_info(self, line: str) -> bool:
         """
@@ -72,86 +184,93 @@ class LogParser:
         """
         return line.startswith("Student Info")
 
-    def _process_student_info(self, line: str, unique_students: set) -> None:
+    def _process_student_info(
+        self, student_names: dict[str, int], fields: Optional[list[str]]
+    ) -> None:
         """
-        Processes a line containing student information.
+        Sets student_info from the most recent student information line.
         Raises an error if multiple unique students are found.
         """
-        parts = line.split(", ")
+        if fields is None:
+            return
+
         # Example: "Student Info, 790, jovyan, 2024-12-27 19:40:10"
-        student_name = parts[2].strip()
-        unique_students.add(student_name)
+        student_name = fields[2].strip()
 
-        if len(unique_students) > 1:
+        if len(student_names) > 1:
+            # Name the most recent student and the most recent other student
+            other_name = max(
+                (name for name in student_names if name != student_name),
+                key=student_names.__getitem__,
+            )
+            unique_students = {student_name, other_name}
             raise ValueError(
                 f"Error: Multiple unique student names found: {unique_students}"
             )
 
-        # Only set student_info once
-        if not self.student_info:
-            self.student_info = {
-                "student_id": parts[1].strip(),
-                "username": student_name,
-                "timestamp": parts[3].strip(),
-            }
+        self.student_info = {
+            "student_id": fields[1].strip(),
+            "username": student_name,
+            "timestamp": fields[3].strip(),
+        }
 
-    def _process_assignment_header(self, line: str) -> None:
-        parts = line.split(",")
-        assignment_tag = parts[0].strip()
-        if assignment_tag.startswith("total-points"):
-            # Handle total-points lines as assignment info
-            total_points_value = self._extract_total_points(parts)
-            timestamp = parts[-1].strip()
-            notebook_name = parts[3].strip()
-
-            if notebook_name not in self.assignments:
-                self.assignments[notebook_name] = {
-                    "max_points": total_points_value,
-                    "notebook": notebook_name,
-                    "assignment": self.week_tag,
-                    "total_score": 0.0,
-                    "latest_timestamp": timestamp,
-                    "questions": {},  # Ensure 'questions' key is initialized
-                }
-            elif self.assignments[notebook_name]["latest_timestamp"] < timestamp:
-                self.assignments[notebook_name]["max_points"] = total_points_value
-                self.assignments[notebook_name]["latest_timestamp"] = timestamp
+    def _process_assignment_header(
+        self, notebooks: dict[str, NotebookRecord], index: int, parts: list[str]
+    ) -> None:
+        """
+        Records a "total-points" line against its notebook, keeping the most recent.
+        """
+        notebook_name = parts[3].strip()
+        timestamp_text = parts[-1].strip()
+        timestamp = timestamp_key(timestamp_text)
+
+        record = notebooks.get(notebook_name)
+        if record is None:
+            record = notebooks[notebook_name] = NotebookRecord()
 
-    def _process_assignment_entry(self, line: str) -> None:
+        # Later lines win timestamp ties
+        if record.header_index < 0 or timestamp >= record.header_timestamp:
+            record.header_timestamp = timestamp
+            record.header_timestamp_text = timestamp_text
+            record.max_points = self._extract_total_points(parts)
+        record.header_index = index
+
+    def _process_assignment_entry(
+        self, notebooks: dict[str, NotebookRecord], index: int, parts: list[str]
+    ) -> None:
         """
-        Processes a line containing an assignment entry.
-        Adds it to the assignments dictionary.
+        Records a question line against its notebook, keeping the most recent entry
+        per question.
         """
-        parts = line.split(",")
         assignment_tag = parts[0].strip()
         question_tag = parts[1].strip()
-        score_earned = float(parts[2].strip()) if len(parts) > 2 else 0.0
-        score_possible = float(parts[3].strip()) if len(parts) > 3 else 0.0
-        timestamp = parts[-1].strip()
-
-        # Ensure assignment entry exists
-        if assignment_tag not in self.assignments:
-            self.assignments[assignment_tag] = {
-                "questions": {},
-                "total_score": 0.0,
-                "latest_timestamp": timestamp,
-            }
-
-        # Add or update the question with the most recent timestamp
-        questions = self.assignments[assignment_tag]["questions"]
-        if (
-            question_tag not in questions
-            or timestamp > questions[question_tag]["timestamp"]
-        ):
-            questions[question_tag] = {
-                "score_earned": score_earned,
-                "score_possible": score_possible,
-                "timestamp": timestamp,
-            }
-
-        # Update the latest timestamp if this one is more recent
-        if timestamp > self.assignments[assignment_tag]["latest_timestamp"]:
-            self.assignments[assignment_tag]["latest_timestamp"] = timestamp
+        timestamp_text = parts[-1].strip()
+        timestamp = timestamp_key(timestamp_text)
+
+        record = notebooks.get(assignment_tag)
+        if record is None:
+            record = notebooks[assignment_tag] = NotebookRecord()
+
+        question = record.questions.get(question_tag)
+        if question is None:
+            record.questions[question_tag] = QuestionRecord(
+                fields=parts,
+                timestamp=timestamp,
+                timestamp_text=timestamp_text,
+                last_index=index,
+            )
+        else:
+            # Later lines win timestamp ties
+            if timestamp >= question.timestamp:
+                question.fields = parts
+                question.timestamp = timestamp
+                question.timestamp_text = timestamp_text
+            question.last_index = index
+
+        if record.entry_index < 0 or timestamp >= record.entry_timestamp:
+            record.entry_timestamp = timestamp
+            record.entry_timestamp_text = timestamp_text
+        record.entry_index = index
 
     def _extract_total_points(self, parts: list[str]) -> Optional[float]:
         """
@@ -167,10 +286,9 @@ class LogParser:
         Calculates total scores for each assignment by summing the 'score_earned'
         of its questions, and sets 'total_points' if it was not specified.
         """
-        for data in self.assignments.values():
+        for record in self.assignments.values():
             # Sum of all question score_earned
-            total_score = sum(q["score_earned"] for q in data["questions"].values())
-            data["total_score"] = total_score
+            record.total_score = sum(q.score_earned for q in record.questions.values())
 
     def get_results(self) -> LogParserResults:
         """
@@ -189,35 +307,79 @@ class LogParser:
             ),
             assignment_information={
                 assignment: {
-                    "latest_timestamp": data["latest_timestamp"],
-                    "total_score": data["total_score"],
-                    "max_points": data.get("max_points", 0.0),
+                    "latest_timestamp": record.latest_timestamp,
+                    "total_score": record.total_score,
+                    "max_points": (
+                        record.max_points if record.header_index >= 0 else 0.0
+                    ),
                 }
-                for assignment, data in self.assignments.items()
+                for assignment, record in self.assignments.items()
             },
             assignment_scores={
                 assignment: {
-                    "questions": data["questions"],
-                    "total_score": data["total_score"],
+                    "questions": {
+                        question_tag: {
+                            "score_earned": question.score_earned,
+                            "score_possible": question.score_possible,
+                            "timestamp": question.timestamp_text,
+                        }
+                        for question_tag, question in record.questions.items()
+                    },
+                    "total_score": record.total_score,
                 }
-                for assignment, data in self.assignments.items()
+                for assignment, record in self.assignments.items()
             },
         )
 
 
+CHUNK_SIZE = 64 * 1024
+ENCRYPTED_MARKER = b"Encrypted Output: "
+
+
+def iter_lines(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields the lines of a binary stream, reading it in fixed-size chunks so that only
+    one chunk (plus any partial line) is held at a time.
+    """
+    buffer = b""
+    while chunk := stream.read(chunk_size):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        yield from lines
+
+    if buffer:
+        yield buffer
+
+
+def iter_decrypted(stream: BinaryIO, key_box: Box) -> Iterator[str]:
+    """
+    Yields the decrypted contents of each "Encrypted Output:" line of a log stream.
+    """
+    for line in iter_lines(stream):
+        if ENCRYPTED_MARKER not in line:
+            continue
+
+        trimmed = line.split(ENCRYPTED_MARKER)[1].strip()
+        decoded = base64.b64decode(trimmed)
+        decrypted = key_box.decrypt(decoded).decode()
+        # here is a minor fix to the log parser to remove the line that contains JCA
+        if "Student Info, 463, JCA," in decrypted:
+            continue
+        yield decrypted
+
+
 def read_logfile(filepath: str, key_box: Box) -> list[str]:
-    with open(filepath, "r") as logfile:
-        encrypted_lines = logfile.readlines()
-
-    decrypted_log: list[str] = []
-    for line in encrypted_lines:
-        if "Encrypted Output: " in line:
-            trimmed = line.split("Encrypted Output: ")[1].strip()
-            decoded = base64.b64decode(trimmed)
-            decrypted = key_box.decrypt(decoded).decode()
-            # here is a minor fix to the log parser to remove the line that contains JCA
-            if "Student Info, 463, JCA," in decrypted:
-                continue
-            decrypted_log.append(decrypted)
+    with open(filepath, "rb") as logfile:
+        return list(iter_decrypted(logfile, key_box))
+
+
+def parse_log_stream(stream: BinaryIO, key_box: Box, week_tag: str) -> LogParserResults:
+    """
+    Decrypts and parses a log stream in one step, so that the whole pipeline can be
+    handed to a worker thread.
+    """
+    parser = LogParser(log_lines=iter_decrypted(stream, key_box), week_tag=week_tag)
+    parser.parse_logs()
+    parser.calculate_total_scores()
 
-    return decrypted_log
+    return parser.get_results()
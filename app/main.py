@@ -1,9 +1,11 @@
+import asyncio
 import csv
 import ipaddress
+import logging
 import random
-import tempfile
+from contextlib import asynccontextmanager
 from io import StringIO
-from typing import Annotated, Any, List, Optional, TypeAlias
+from typing import Annotated, Any, List, Literal, Optional, TypeAlias
 
 from dateutil import parser as date_parser
 from fastapi import (
@@ -13,37 +15,89 @@ from fastapi import (
     HTTPException,
     Query,
     Request,
+    Response,
     UploadFile,
     status,
 )
 from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from sqlalchemy.orm import Session
-
-from . import crud_admin, crud_student, log_parser, schemas, utils
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import (
+    bulk,
+    crud_admin,
+    crud_student,
+    invalidation,
+    log_parser,
+    pagination,
+    schemas,
+    token_reaper,
+    utils,
+    workers,
+)
 from .auth import verify_admin, verify_student, verify_ta_user, verify_testing
-from .db import SessionLocal
-from .live_scorer import Score, calculate_score
+from .db import AsyncSessionLocal, PoolStats, get_pool_stats
+from .live_scorer import (
+    SOLUTIONS_WATCH_INTERVAL,
+    ReloadResult,
+    Score,
+    calculate_score,
+    reload_registry,
+    watch_solutions,
+)
 from .question import valid_submission
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Optionally pick up new solution files without a restart
+    watcher = None
+    if SOLUTIONS_WATCH_INTERVAL > 0:
+        watcher = asyncio.create_task(watch_solutions(SOLUTIONS_WATCH_INTERVAL))
+
+    # Evict caches when another replica changes the data behind them
+    listener = None
+    if invalidation.INVALIDATION_LISTEN:
+        listener = asyncio.create_task(invalidation.listen())
+
+    # Archive expired tokens; replicas take turns via an advisory lock
+    reaper = None
+    if token_reaper.TOKEN_REAPER_INTERVAL > 0:
+        reaper = asyncio.create_task(
+            token_reaper.run_reaper(token_reaper.TOKEN_REAPER_INTERVAL)
+        )
+
+    yield
+
+    # Let the tasks unwind (e.g., the reaper releasing its lock) before shutting down
+    tasks = [task for task in (watcher, listener, reaper) if task]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Another replica reloaded its solutions; pick up the same files
+invalidation.subscribe("solutions", lambda key: asyncio.to_thread(reload_registry))
+
+
+app = FastAPI(lifespan=lifespan)
 
 security = HTTPBasic()
 Credentials: TypeAlias = Annotated[HTTPBasicCredentials, Depends(security)]
+PageQuery: TypeAlias = Annotated[pagination.PageParams, Depends()]
 
 
 # Dependency for obtaining a database session
-def get_db():
+async def get_db():
     """
-    Yields a database session for use in route handlers.
+    Yields an async database session for use in route handlers.
 
     Closes the session automatically after the request is handled.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 # -----------------------------
@@ -74,11 +128,13 @@ async def root(req: Request, jhub_user: str = Query(None)):
 
 @app.post("/execution-logs")
 async def add_execution_log(
-    cred: Credentials, req: schemas.ExecutionLogUpload, db: Session = Depends(get_db)
+    cred: Credentials,
+    req: schemas.ExecutionLogUpload,
+    db: AsyncSession = Depends(get_db),
 ) -> str:
     verify_student(cred)  # Raises HTTPException (401) on failure
 
-    upload_timestamp = crud_student.add_execution_log(db=db, log=req)
+    upload_timestamp = await crud_student.add_execution_log(db=db, log=req)
     if not upload_timestamp:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -90,7 +146,9 @@ async def add_execution_log(
 
 @app.post("/live-scorer")
 async def live_scorer(
-    cred: Credentials, req: schemas.ScoringSubmission, db: Session = Depends(get_db)
+    cred: Credentials,
+    req: schemas.ScoringSubmission,
+    db: AsyncSession = Depends(get_db),
 ) -> dict[str, tuple[float, float]]:
     """
     Endpoint for scoring a student's live submission.
@@ -98,17 +156,19 @@ async def live_scorer(
     Args:
         cred (Credentials): Basic authentication credentials for the student.
         req (schemas.ScoringSubmission): The submission details including responses.
-        db (Session): Database session dependency.
+        db (AsyncSession): Database session dependency.
 
     Returns:
         Score: A score object with max_points and points_earned.
     """
     verify_student(cred)
 
-    existing_student = crud_admin.get_student_by_email(db=db, email=req.student_email)
+    existing_student = await crud_admin.get_student_by_email(
+        db=db, email=req.student_email
+    )
     if not existing_student:
         new_student = schemas.Student(email=req.student_email)
-        crud_admin.add_student(db=db, student=new_student)
+        await crud_admin.add_student(db=db, student=new_student)
 
     result = calculate_score(
         term=req.term,
@@ -131,7 +191,7 @@ async def live_scorer(
         result_earned = sum([score[0] for score in result.values()])
         score_for_db = Score(max_points=result_max, points_earned=result_earned)
 
-        crud_student.add_scoring_submission(
+        await crud_student.add_scoring_submission(
             db=db,
             submission=req,
             score=score_for_db,
@@ -142,6 +202,85 @@ async def live_scorer(
     return result
 
 
+@app.post("/live-scorer/batch", response_model=list[schemas.ScoringResult])
+async def live_scorer_batch(
+    cred: Credentials,
+    req: list[schemas.ScoringSubmission],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Endpoint for scoring many of a student's live submissions at once, e.g. for a
+    "check all answers" button.
+
+    Args:
+        cred (Credentials): Basic authentication credentials for the student.
+        req (list[schemas.ScoringSubmission]): The submissions, all for one student.
+        db (AsyncSession): Database session dependency.
+
+    Returns:
+        list[schemas.ScoringResult]: The scores, or an error message, for each item,
+        in the order submitted.
+    """
+    verify_student(cred)
+
+    student_emails = {item.student_email for item in req}
+    if len(student_emails) != 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batch must contain submissions for exactly one student",
+        )
+
+    student_email = student_emails.pop()
+    existing_student = await crud_admin.get_student_by_email(db=db, email=student_email)
+    if not existing_student:
+        new_student = schemas.Student(email=student_email)
+        await crud_admin.add_student(db=db, student=new_student)
+
+    results: list[schemas.ScoringResult] = []
+    scored: list[tuple[schemas.ScoringSubmission, Score]] = []
+
+    for item in req:
+        result = calculate_score(
+            term=item.term,
+            week=item.week,
+            assignment=item.assignment,
+            question=item.question,
+            responses=item.responses,
+        )
+
+        if isinstance(result, str):
+            results.append(
+                schemas.ScoringResult(
+                    term=item.term,
+                    week=item.week,
+                    assignment=item.assignment,
+                    question=item.question,
+                    error=result,
+                )
+            )
+            continue
+
+        results.append(
+            schemas.ScoringResult(
+                term=item.term,
+                week=item.week,
+                assignment=item.assignment,
+                question=item.question,
+                scores=result,
+            )
+        )
+
+        result_max = sum([score[1] for score in result.values()])
+        result_earned = sum([score[0] for score in result.values()])
+        scored.append((item, Score(max_points=result_max, points_earned=result_earned)))
+
+    # One transaction for the whole batch; items whose assignment is not in the
+    # database are skipped, as with the single-item endpoint
+    await crud_student.add_scoring_submissions(db=db, scored=scored)
+
+    return results
+
+
 @app.post("/login")
 async def login(cred: Credentials):
     """
@@ -165,14 +304,14 @@ async def login(cred: Credentials):
 
 @app.post("/questions", response_model=schemas.Question)
 async def add_question(
-    cred: Credentials, question: schemas.Question, db: Session = Depends(get_db)
+    cred: Credentials, question: schemas.Question, db: AsyncSession = Depends(get_db)
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
     # Add question to database
     # Raises 400 if question already exists
     # TODO: Add logic to update existing question
-    return crud_admin.add_question(db=db, question=question)
+    return await crud_admin.add_question(db=db, question=question)
 
 
 @app.post("/score-assignment")
@@ -180,7 +319,7 @@ async def score_assignment(
     cred: Credentials,
     assignment_title: str,
     notebook_title: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     log_file: UploadFile = File(...),
     key_used: str = Query(None),
 ):
@@ -196,23 +335,16 @@ async def score_assignment(
         str: A message indicating that the file and submission were received
     """
 
-    verify_student(cred)  # Raises HTTPException (401) on failure
+    # Raises HTTPException (401) on failure; bcrypt runs off the event loop
+    await workers.run_cpu(verify_student, cred)
 
     # Get public/private keypair for decryption
     key_box = utils.get_key_box()
 
-    # Decrypt log file
-    with tempfile.NamedTemporaryFile(delete=True) as temp_file:
-        temp_file.write(await log_file.read())
-        temp_file.flush()
-
-        decrypted = log_parser.read_logfile(temp_file.name, key_box)
-
-    # Parse log file
-    parser = log_parser.LogParser(log_lines=decrypted, week_tag=assignment_title)
-    parser.parse_logs()
-    parser.calculate_total_scores()
-    results = parser.get_results()
+    # Decrypt and parse log file on the CPU worker pool, streaming it in chunks
+    results = await workers.run_cpu(
+        log_parser.parse_log_stream, log_file.file, key_box, assignment_title
+    )
 
     # Extract week number, assignment type, and submission time from log file
     week_number: Optional[int] = results["week_num"]
@@ -230,18 +362,24 @@ async def score_assignment(
             detail="Week number or assignment type not found",
         )
 
-    crud_student.check_completed_assignment(
+    # All reads needed for scoring happen in one round trip
+    context = await crud_student.get_submission_context(
         db=db,
-        student_id=student_email,
-        assignment_type=assignment_type,
+        student_email=student_email,
+        assignment=assignment_title,
         week_number=week_number,
+        assignment_type=assignment_type,
+        notebook_title=notebook_title,
     )
 
-    max_score_db, due_date_db = (
-        crud_student.get_max_score_and_due_date_by_week_and_type(
-            db=db, week_number=week_number, assignment_type=assignment_type
+    if context.already_completed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Student has already completed this assignment and cannot submit again.",
         )
-    )
+
+    max_score_db = context.assignment_max_score
+    due_date_db = context.assignment_due_date
 
     if not max_score_db:
         raise HTTPException(
@@ -255,10 +393,7 @@ async def score_assignment(
             detail="Assignment due date not found in database",
         )
 
-    max_score_notebook = crud_student.get_notebook_max_score_by_notebook(
-        db=db,
-        notebook_title=notebook_title,
-    )
+    max_score_notebook = context.notebook_max_score
 
     if not max_score_notebook:
         raise HTTPException(
@@ -277,19 +412,15 @@ async def score_assignment(
 
     modified_grade = (total_score / max_score_db) * (grade_modifier / 100)
 
-    # Find the student's best score for this assignment
-    current_best_db = crud_student.get_best_score(
-        db=db, student_email=student_email, assignment=assignment_title
-    )
-
-    current_best = current_best_db.current_max_score if current_best_db else None
+    # Compare against the student's best score for this assignment
+    current_best = context.current_best
     if current_best is None or modified_grade > current_best:
         current_best = modified_grade
 
-    # Add assignment and notebook scores to the database
-    crud_student.add_submitted_assignment_score(
+    # Add assignment and notebook scores to the database, in one transaction
+    await crud_student.add_assignment_and_notebook_submissions(
         db=db,
-        submission=schemas.AssignmentSubmission(
+        assignment_submission=schemas.AssignmentSubmission(
             student_email=student_email,
             assignment=assignment_title,
             week_number=week_number,
@@ -303,11 +434,7 @@ async def score_assignment(
             current_max_score=current_best,
             key_used=key_used,
         ),
-    )
-
-    crud_student.add_notebook_submission(
-        db=db,
-        submission=schemas.NotebookSubmission(
+        notebook_submission=schemas.NotebookSubmission(
             student_email=student_email,
             notebook=notebook_title,
             week_number=week_number,
@@ -384,7 +511,9 @@ async def score_assignment(
 
 @app.post("/submit-question")
 async def submit_question(
-    cred: Credentials, req: schemas.QuestionSubmission, db: Session = Depends(get_db)
+    cred: Credentials,
+    req: schemas.QuestionSubmission,
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Endpoint for submitting question responses and scores.
@@ -392,14 +521,16 @@ async def submit_question(
     Args:
         cred (Credentials): Basic authentication credentials for the student.
         req (schemas.QuestionSubmission): The question submission details.
-        db (Session): Database session dependency.
+        db (AsyncSession): Database session dependency.
 
     Returns:
         str: A message indicating successful submission to the database.
     """
     verify_student(cred)
 
-    existing_student = crud_admin.get_student_by_email(db=db, email=req.student_email)
+    existing_student = await crud_admin.get_student_by_email(
+        db=db, email=req.student_email
+    )
     if not existing_student:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -421,7 +552,7 @@ async def submit_question(
         )
 
     # Raises HTTPException (500) if assignment not in database
-    _db_submission = crud_student.add_question_submission(
+    _db_submission = await crud_student.add_question_submission(
         db=db,
         submission=req,
     )
@@ -459,7 +590,10 @@ async def validate_log_decryption(cred: Credentials, log_file: UploadFile):
 
 @app.get("/my-grades", response_model=dict[str, float])
 async def get_my_grades(
-    request: Request, cred: Credentials, username: str, db: Session = Depends(get_db)
+    request: Request,
+    cred: Credentials,
+    username: str,
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Endpoint for a student to retrieve their own grades
@@ -467,7 +601,7 @@ async def get_my_grades(
     Args:
         cred (Credentials): Basic Auth credentials for the student
         username (str): Student's email address prefix
-        db (Session): Database session dependency
+        db (AsyncSession): Database session dependency
 
     Returns:
         dict: Student's best grade for each assignment
@@ -490,12 +624,15 @@ async def get_my_grades(
 
     verify_student(cred)  # Raises HTTPException (401) on failure
 
-    return crud_student.get_my_grades(db=db, student_email=username)
+    return await crud_student.get_my_grades(db=db, student_email=username)
 
 
 @app.get("/my-grades-testing")
 async def get_my_grades_testing(
-    request: Request, cred: Credentials, username: str, db: Session = Depends(get_db)
+    request: Request,
+    cred: Credentials,
+    username: str,
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Endpoint for a student to retrieve their own grades
@@ -503,7 +640,7 @@ async def get_my_grades_testing(
     Args:
         cred (Credentials): Basic Auth credentials for the student
         username (str): Student's email address prefix
-        db (Session): Database session dependency
+        db (AsyncSession): Database session dependency
 
     Returns:
         dict: Student's best grade for each assignment
@@ -526,14 +663,14 @@ async def get_my_grades_testing(
 
     verify_student(cred)  # Raises HTTPException (401) on failure
 
-    return crud_student.get_my_grades_testing(db=db, student_email=username)
+    return await crud_student.get_my_grades_testing(db=db, student_email=username)
 
 
 @app.get("/validate-token/{token_value}")
 async def validate_token(
     cred: Credentials,
     token_value: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     assignment: Optional[str] = Query(None),  # ✅ Optional query param
     student_id: Optional[str] = Query(None),  # ✅ Optional query param
 ) -> dict[str, str]:
@@ -542,7 +679,7 @@ async def validate_token(
 
     Args:
         token_value (str): The value of the token to validate.
-        db (Session): Database session dependency.
+        db (AsyncSession): Database session dependency.
         assignment (Optional[str]): Optional assignment filter.
         student_id (Optional[int]): Optional student ID filter.
 
@@ -554,21 +691,15 @@ async def validate_token(
     """
     verify_student(cred)
 
-    # Raises 404 if token not found, 400 if expired
-    expiry = crud_student.get_token_expiry(db=db, value=token_value)
-
-    token = crud_student.validate_token_filters(
+    # Raises 404 if token not found (or not for this student/assignment), 400 if
+    # expired; one cached lookup answers both checks
+    expiry = await crud_student.validate_token(
         db,
         value=token_value,
         assignment=assignment,
         student_id=student_id,
     )
 
-    if not token:
-        raise HTTPException(
-            status_code=404, detail="Token with given filters not found"
-        )
-
     return {"status": "valid", "expires_at": expiry}
 
 
@@ -604,7 +735,10 @@ async def validate_token(
 
 @app.get("/student-grades-testing")
 async def get_student_grades_testing(
-    request: Request, cred: Credentials, username: str, db: Session = Depends(get_db)
+    request: Request,
+    cred: Credentials,
+    username: str,
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Endpoint for a student to retrieve their own grades
@@ -612,7 +746,7 @@ async def get_student_grades_testing(
     Args:
         cred (Credentials): Basic Auth credentials for the student
         username (str): Student's email address prefix
-        db (Session): Database session dependency
+        db (AsyncSession): Database session dependency
 
     Returns:
         dict: Student's best grade for each assignment
@@ -620,27 +754,29 @@ async def get_student_grades_testing(
 
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    return crud_student.get_my_grades_testing(db=db, student_email=username)
+    return await crud_student.get_my_grades_testing(db=db, student_email=username)
 
 
 @app.post("/notebook", response_model=schemas.Notebook)
 async def add_notebook(
-    cred: Credentials, notebook: schemas.Notebook, db: Session = Depends(get_db)
+    cred: Credentials, notebook: schemas.Notebook, db: AsyncSession = Depends(get_db)
 ):
     verify_admin(cred)
 
-    existing_notebook = crud_admin.get_notebook_by_title(db=db, title=notebook.title)
+    existing_notebook = await crud_admin.get_notebook_by_title(
+        db=db, title=notebook.title
+    )
 
     if existing_notebook:
         # Update existing notebook
-        updated_notebook = crud_admin.update_notebook(
+        updated_notebook = await crud_admin.update_notebook(
             db=db, title=notebook.title, notebook=notebook
         )
         if updated_notebook:
             return updated_notebook
 
     # Create a new notebook
-    return crud_admin.add_notebook(db=db, notebook=notebook)
+    return await crud_admin.add_notebook(db=db, notebook=notebook)
 
 
 @app.post("/assignments", response_model=schemas.Assignment)
@@ -648,11 +784,11 @@ async def add_assignment(
     cred: Credentials,
     assignment: schemas.Assignment,
     update: Optional[bool] = True,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    existing_assignment = crud_admin.get_assignment_by_title(
+    existing_assignment = await crud_admin.get_assignment_by_title(
         db=db, title=assignment.title
     )
 
@@ -664,31 +800,88 @@ async def add_assignment(
             )
 
         # Otherwise, update existing assignment
-        return crud_admin.update_assignment(
+        return await crud_admin.update_assignment(
             db=db, title=assignment.title, assignment=assignment
         )
 
     # Create a new assignment
-    return crud_admin.add_assignment(db=db, assignment=assignment)
+    return await crud_admin.add_assignment(db=db, assignment=assignment)
+
+
+@app.post("/assignments/bulk", response_model=schemas.ScheduleUpsertResult)
+async def add_assignments_bulk(
+    cred: Credentials,
+    schedule: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Endpoint for adding or updating a whole schedule of assignments at once.
+
+    Args:
+        cred (Credentials): Basic authentication credentials for the admin.
+        schedule (UploadFile): A CSV file with a header row, or a JSON array, of
+            assignments, as for POST /assignments. Assignments are matched by
+            title; description may be left out, and is then not changed.
+        db (AsyncSession): Database session dependency.
+
+    Returns:
+        schemas.ScheduleUpsertResult: The titles inserted and left unchanged, and the
+        old and new values of each changed field, by title.
+    """
+    verify_admin(cred)  # Raises HTTPException (401) on failure
+
+    # Raises HTTPException (400/422) on a malformed schedule
+    assignments, fields = await bulk.read_upload(schedule, schemas.Assignment)
+
+    return await crud_admin.upsert_assignments(
+        db=db, assignments=assignments, fields=fields
+    )
+
+
+@app.post("/notebooks/bulk", response_model=schemas.ScheduleUpsertResult)
+async def add_notebooks_bulk(
+    cred: Credentials,
+    schedule: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Endpoint for adding or updating a whole schedule of notebooks at once.
+
+    Args:
+        cred (Credentials): Basic authentication credentials for the admin.
+        schedule (UploadFile): A CSV file with a header row, or a JSON array, of
+            notebooks, as for POST /notebook. Notebooks are matched by title.
+        db (AsyncSession): Database session dependency.
+
+    Returns:
+        schemas.ScheduleUpsertResult: The titles inserted and left unchanged, and the
+        old and new values of each changed field, by title.
+    """
+    verify_admin(cred)  # Raises HTTPException (401) on failure
+
+    # Raises HTTPException (400/422) on a malformed schedule
+    notebooks, fields = await bulk.read_upload(schedule, schemas.Notebook)
+
+    return await crud_admin.upsert_notebooks(db=db, notebooks=notebooks, fields=fields)
 
 
 @app.post("/grade-updates", response_model=schemas.AssignmentSubmission)
 async def update_assignment_grade(
     cred: Credentials,
     grade_update: schemas.GradeUpdateRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
     # Raises 404 if no submission found for this student and assignment
-    best_submission_id = crud_admin.find_best_submission_id(
+    best_submission_id = await crud_admin.find_best_submission_id(
         db=db,
         student_email=grade_update.student_email,
         assignment=grade_update.assignment,
     )
 
     # Raises 500 if anything doesn't match on the DB side
-    return crud_admin.update_assignment_score(
+    return await crud_admin.update_assignment_score(
         db=db,
         submission_id=best_submission_id,
         student_email=grade_update.student_email,
@@ -697,9 +890,37 @@ async def update_assignment_grade(
     )
 
 
+@app.post("/grade-updates/bulk", response_model=schemas.BulkGradeUpdateResult)
+async def update_assignment_grades_bulk(
+    cred: Credentials,
+    grade_updates: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Endpoint for applying many grade overrides (e.g., a round of regrades) at once.
+
+    Args:
+        cred (Credentials): Basic authentication credentials for the admin.
+        grade_updates (UploadFile): A CSV file with a header row, or a JSON array, of
+            overrides (student_email, assignment, updated_score), as for
+            POST /grade-updates.
+        db (AsyncSession): Database session dependency.
+
+    Returns:
+        schemas.BulkGradeUpdateResult: The number of submissions updated, and the
+        overrides not applied (e.g., with no submission to override), by record.
+    """
+    verify_admin(cred)  # Raises HTTPException (401) on failure
+
+    # Raises HTTPException (400/422) on a malformed file
+    updates, _ = await bulk.read_upload(grade_updates, schemas.GradeUpdateRequest)
+
+    return await crud_admin.update_assignment_scores(db=db, updates=updates)
+
+
 @app.post("/students", response_model=schemas.Student)
 async def add_student(
-    cred: Credentials, student: schemas.Student, db: Session = Depends(get_db)
+    cred: Credentials, student: schemas.Student, db: AsyncSession = Depends(get_db)
 ):
     """
     Endpoint for adding a new student to the database.
@@ -707,26 +928,54 @@ async def add_student(
     Args:
         cred (Credentials): Basic authentication credentials for the admin.
         student (schemas.Student): The student details.
-        db (Session): Database session dependency.
+        db (AsyncSession): Database session dependency.
 
     Returns:
         schemas.Student: The newly created student object.
     """
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    existing_entry = crud_admin.get_student_by_email(db=db, email=student.email)
+    existing_entry = await crud_admin.get_student_by_email(db=db, email=student.email)
     if existing_entry:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    return crud_admin.add_student(db=db, student=student)
+    return await crud_admin.add_student(db=db, student=student)
+
+
+@app.post("/students/bulk", response_model=schemas.BulkUpsertResult)
+async def add_students_bulk(
+    cred: Credentials,
+    roster: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Endpoint for adding or updating a whole class roster at once.
+
+    Args:
+        cred (Credentials): Basic authentication credentials for the admin.
+        roster (UploadFile): A CSV file with a header row, or a JSON array, of
+            students (email, family_name, given_name, lecture_section, lab_section).
+            Only email is required, and every record must have the same fields;
+            fields left out of the file are not changed for existing students.
+        db (AsyncSession): Database session dependency.
+
+    Returns:
+        schemas.BulkUpsertResult: Counts of inserted, updated and unchanged students.
+    """
+    verify_admin(cred)  # Raises HTTPException (401) on failure
+
+    # Raises HTTPException (400/422) on a malformed roster
+    students, fields = await bulk.read_upload(roster, schemas.Student)
+
+    return await crud_admin.upsert_students(db=db, students=students, fields=fields)
 
 
 @app.post("/tokens", response_model=schemas.Token)
 async def create_token(
-    cred: Credentials, token: schemas.TokenRequest, db: Session = Depends(get_db)
+    cred: Credentials, token: schemas.TokenRequest, db: AsyncSession = Depends(get_db)
 ):
     try:
         # Admins can of course create tokens
@@ -736,28 +985,88 @@ async def create_token(
         # TODO: Make this non-spoofable if possible
         verify_ta_user(username=token.requester)  # Raises HTTPException (403)
 
-    existing_token = crud_admin.get_token_by_value(db=db, value=token.value)
+    existing_token = await crud_admin.get_token_by_value(db=db, value=token.value)
 
     # TODO: Revisit this logic; does it make sense to update an old token?
     # Josh, yes, I think it does, or you could just add a more recent token if that is what you are thinking
     if existing_token:
-        return crud_admin.update_token(db=db, token=token)
+        return await crud_admin.update_token(db=db, token=token)
+
+    return await crud_admin.create_token(db=db, token_req=token)
+
+
+@app.post("/tokens/bulk")
+async def mint_tokens(
+    cred: Credentials,
+    batch: schemas.TokenBatchRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Endpoint for creating tokens for many students at once (e.g., before an exam).
+
+    Token values are generated here, and returned only in the response.
+
+    Args:
+        cred (Credentials): Basic authentication credentials for the admin or a TA.
+        batch (schemas.TokenBatchRequest): The assignment, duration, and either a
+            list of student emails or a lecture and/or lab section.
+        db (AsyncSession): Database session dependency.
+
+    Returns:
+        StreamingResponse: A CSV of the tokens (student_email, value, assignment,
+        expires), ordered by student email.
+    """
+    try:
+        # Admins can of course create tokens
+        verify_admin(cred)  # Raises HTTPException (401) on failure
+    except HTTPException:
+        # As with POST /tokens, this is mostly for TAs
+        verify_ta_user(username=batch.requester)  # Raises HTTPException (403)
+
+    # Raises 400/404 if the students can't be resolved
+    tokens = await crud_admin.mint_tokens(db=db, batch=batch)
+
+    def generate_rows():
+        output = StringIO()
+        writer = csv.writer(output)
+
+        writer.writerow(["student_email", "value", "assignment", "expires"])
+        for token in tokens:
+            writer.writerow(
+                [
+                    token.student_id,
+                    token.value,
+                    token.assignment,
+                    token.expires.isoformat(),
+                ]
+            )
+
+            # Send rows in chunks, rather than one tiny write per token
+            if output.tell() >= 64 * 1024:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
 
-    return crud_admin.create_token(db=db, token_req=token)
+        yield output.getvalue()
+
+    response = StreamingResponse(generate_rows(), media_type="text/csv")
+    response.headers["Content-Disposition"] = "attachment; filename=tokens.csv"
+
+    return response
 
 
 @app.post("/completed-assignments", response_model=schemas.StudentsCompletedAssignments)
 async def completed_assignments(
     cred: Credentials,
     StudentsCompletedAssignments: schemas.StudentsCompletedAssignments,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     verify_student(cred)  # Raises HTTPException (401) on failure
 
     # Add question to database
     # Raises 400 if question already exists
     # TODO: Add logic to update existing question
-    return crud_student.students_completed_assignments(
+    return await crud_student.students_completed_assignments(
         db=db, StudentsCompletedAssignments=StudentsCompletedAssignments
     )
 
@@ -772,11 +1081,11 @@ async def delete_completed_assignment(
     week_number: Optional[int],
     assignment_type: Optional[str],
     key_used: Optional[str],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    db_submission = crud_admin.delete_completed_assignment(
+    db_submission = await crud_admin.delete_completed_assignment(
         db=db,
         student_email=student_email,
         assignment=assignment,
@@ -824,7 +1133,7 @@ async def delete_completed_assignment(
 @app.get("/assignment-grades", response_model=List[schemas.AssignmentSubmission])
 async def get_assignment_grades(
     cred: Credentials,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     assignment_type: str = Query(..., description="Type of assignment"),
     week_number: int = Query(..., description="Week number for the assignment"),
 ):
@@ -833,7 +1142,7 @@ async def get_assignment_grades(
 
     Args:
         cred (dict): Verified admin credentials.
-        db (Session): Database session.
+        db (AsyncSession): Database session.
         assignment_type (str): Type of the assignment.
         week_number (int): Week number for filtering grades.
 
@@ -842,7 +1151,7 @@ async def get_assignment_grades(
     """
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    return crud_admin.get_assignment_grades(
+    return await crud_admin.get_assignment_grades(
         db=db, assignment_type=assignment_type, week_number=week_number
     )
 
@@ -850,10 +1159,12 @@ async def get_assignment_grades(
 @app.get("/assignments", response_model=list[schemas.Assignment])
 async def get_all_assignments(
     cred: Credentials,
+    response: Response,
+    page: PageQuery,
     requester: Optional[str] = Query(
         None, description="The username making the request"
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     try:
         # Admins can of course create tokens
@@ -863,34 +1174,109 @@ async def get_all_assignments(
         # TODO: Make this non-spoofable if possible
         verify_ta_user(username=requester)  # Raises HTTPException (403)
 
-    return crud_admin.get_assignments(db=db)
+    if page.format == "ndjson":
+        return await pagination.ndjson_response(
+            lambda db, cursor, limit: crud_admin.get_assignments(
+                db=db, cursor=cursor, limit=limit
+            ),
+            serialize=lambda assignment: schemas.Assignment.model_validate(
+                assignment, from_attributes=True
+            ),
+            cursor=page.cursor,
+        )
+
+    return pagination.page_items(
+        response,
+        await crud_admin.get_assignments(db=db, cursor=page.cursor, limit=page.limit),
+    )
+
+
+@app.post("/solutions/reload", response_model=ReloadResult)
+async def reload_solutions(cred: Credentials, db: AsyncSession = Depends(get_db)):
+    """
+    Rebuild the solution registry from the files on disk and swap it in, e.g. after
+    move_solutions.py has copied in new solutions. Scoring continues against the old
+    registry until the new one is complete. Other replicas are told to reload too.
+    """
+    verify_admin(cred)  # Raises HTTPException (401) on failure
+
+    # Broken solution files are skipped; this fails only if the tree can't be read
+    try:
+        result = await asyncio.to_thread(reload_registry)
+    except Exception as e:
+        logger.exception("Failed to reload solution registry")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reload solution registry: {e}",
+        )
+
+    await invalidation.publish(db, "solutions")
+    await db.commit()
+
+    return result
+
+
+@app.get("/stats/cpu-workers", response_model=workers.WorkerStats)
+async def get_cpu_worker_stats(cred: Credentials):
+    verify_admin(cred)  # Raises HTTPException (401) on failure
+
+    return workers.get_stats()
+
+
+@app.get("/stats/db-pool", response_model=PoolStats)
+async def get_db_pool_stats(cred: Credentials):
+    verify_admin(cred)  # Raises HTTPException (401) on failure
+
+    return get_pool_stats()
 
 
 @app.get("/notebooks", response_model=list[schemas.Notebook])
-async def get_all_notebooks(cred: Credentials, db: Session = Depends(get_db)):
+async def get_all_notebooks(
+    cred: Credentials,
+    response: Response,
+    page: PageQuery,
+    db: AsyncSession = Depends(get_db),
+):
     verify_admin(cred)
 
-    return crud_admin.get_notebooks(db=db)
+    if page.format == "ndjson":
+        return await pagination.ndjson_response(
+            lambda db, cursor, limit: crud_admin.get_notebooks(
+                db=db, cursor=cursor, limit=limit
+            ),
+            serialize=lambda notebook: schemas.Notebook.model_validate(
+                notebook, from_attributes=True
+            ),
+            cursor=page.cursor,
+        )
+
+    return pagination.page_items(
+        response,
+        await crud_admin.get_notebooks(db=db, cursor=page.cursor, limit=page.limit),
+    )
 
 
 @app.get("/scoring/{email}", response_model=list[schemas.ScoredSubmission])
 async def get_scoring_subs_by_email(
-    cred: Credentials, email: str, db: Session = Depends(get_db)
+    cred: Credentials, email: str, db: AsyncSession = Depends(get_db)
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    return crud_admin.get_scoring_subs_by_email(db=db, email=email)
+    return await crud_admin.get_scoring_subs_by_email(db=db, email=email)
 
 
 @app.get("/students", response_model=list[schemas.Student])
 async def get_all_students(
     cred: Credentials,
+    response: Response,
     requester: Optional[str] = Query(
         None, description="The username making the request"
     ),
-    skip: int = 0,
-    limit: int = 500,
-    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0, description="Deprecated; use cursor"),
+    limit: int = Query(500, ge=1),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the last page"),
+    output_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+    db: AsyncSession = Depends(get_db),
 ):
     try:
         # Admins can of course create tokens
@@ -900,16 +1286,37 @@ async def get_all_students(
         # TODO: Make this non-spoofable if possible
         verify_ta_user(username=requester)  # Raises HTTPException (403)
 
-    return crud_admin.get_all_students(db=db, skip=skip, limit=limit)
+    if skip and cursor is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either skip or cursor, not both",
+        )
+
+    if output_format == "ndjson":
+        return await pagination.ndjson_response(
+            # Later pages start from a cursor, so skip applies to the first only
+            lambda db, cursor, limit: crud_admin.get_all_students(
+                db=db, skip=skip if cursor is None else 0, limit=limit, cursor=cursor
+            ),
+            serialize=lambda student: schemas.Student.model_validate(
+                student, from_attributes=True
+            ),
+            cursor=cursor,
+        )
+
+    return pagination.page_items(
+        response,
+        await crud_admin.get_all_students(db=db, skip=skip, limit=limit, cursor=cursor),
+    )
 
 
 @app.get("/students/{email}", response_model=schemas.Student)
 async def get_student_by_email(
-    cred: Credentials, email: str, db: Session = Depends(get_db)
+    cred: Credentials, email: str, db: AsyncSession = Depends(get_db)
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    db_student = crud_admin.get_student_by_email(db=db, email=email)
+    db_student = await crud_admin.get_student_by_email(db=db, email=email)
     if not db_student:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -920,11 +1327,28 @@ async def get_student_by_email(
 
 
 @app.get("/tokens", response_model=list[tuple[str, str]])
-async def get_all_tokens(cred: Credentials, db: Session = Depends(get_db)):
+async def get_all_tokens(
+    cred: Credentials,
+    response: Response,
+    page: PageQuery,
+    db: AsyncSession = Depends(get_db),
+):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    db_tokens = crud_admin.get_all_tokens(db=db)
-    if not db_tokens:
+    if page.format == "ndjson":
+        return await pagination.ndjson_response(
+            lambda db, cursor, limit: crud_admin.get_all_tokens(
+                db=db, cursor=cursor, limit=limit
+            ),
+            serialize=lambda token: (token.value, token.expires.isoformat()),
+            cursor=page.cursor,
+        )
+
+    db_tokens = pagination.page_items(
+        response,
+        await crud_admin.get_all_tokens(db=db, cursor=page.cursor, limit=page.limit),
+    )
+    if not db_tokens and page.cursor is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No tokens found at endpoint /tokens",
@@ -938,11 +1362,11 @@ async def update_assignment(
     cred: Credentials,
     title: str,
     assignment: schemas.Assignment,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    db_assignment = crud_admin.update_assignment(
+    db_assignment = await crud_admin.update_assignment(
         db=db, title=title, assignment=assignment
     )
 
@@ -954,14 +1378,14 @@ async def update_student(
     cred: Credentials,
     email: str,
     student: schemas.Student,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
     # The email address in the path is used to identify the record to update. If
     # student.email is different, the record will be updated with that address, unless
     # it is already in use -- in which case an HTTPException (400) is raised.
-    db_student = crud_admin.update_student(db=db, email=email, student=student)
+    db_student = await crud_admin.update_student(db=db, email=email, student=student)
 
     # i.e., if no record was found with the email address in the path
     if not db_student:
@@ -975,11 +1399,11 @@ async def update_student(
 
 @app.delete("/students/{email}", response_model=schemas.Student)
 async def delete_student_by_email(
-    cred: Credentials, email: str, db: Session = Depends(get_db)
+    cred: Credentials, email: str, db: AsyncSession = Depends(get_db)
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    db_student = crud_admin.delete_student_by_email(db=db, email=email)
+    db_student = await crud_admin.delete_student_by_email(db=db, email=email)
     if not db_student:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -991,11 +1415,11 @@ async def delete_student_by_email(
 
 @app.delete("/tokens/{value}", response_model=schemas.Token)
 async def delete_token_by_value(
-    cred: Credentials, value: str, db: Session = Depends(get_db)
+    cred: Credentials, value: str, db: AsyncSession = Depends(get_db)
 ):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    db_token = crud_admin.delete_token(db=db, token_value=value)
+    db_token = await crud_admin.delete_token(db=db, token_value=value)
     if not db_token:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1006,10 +1430,28 @@ async def delete_token_by_value(
 
 
 @app.get("/get-all-submission-emails")
-async def get_all_submission_emails(cred: Credentials, db: Session = Depends(get_db)):
+async def get_all_submission_emails(
+    cred: Credentials,
+    response: Response,
+    page: PageQuery,
+    db: AsyncSession = Depends(get_db),
+):
     verify_admin(cred)  # Raises HTTPException (401) on failure
 
-    return crud_admin.get_all_submission_emails(db)
+    if page.format == "ndjson":
+        return await pagination.ndjson_response(
+            lambda db, cursor, limit: crud_admin.get_all_submission_emails(
+                db=db, cursor=cursor, limit=limit
+            ),
+            cursor=page.cursor,
+        )
+
+    return pagination.page_items(
+        response,
+        await crud_admin.get_all_submission_emails(
+            db, cursor=page.cursor, limit=page.limit
+        ),
+    )
 
 
 # -----------------
@@ -1018,37 +1460,62 @@ async def get_all_submission_emails(cred: Credentials, db: Session = Depends(get
 
 
 @app.get("/testing/get-all-assignment-subs")
-async def get_all_assignment_subs(cred: Credentials, db: Session = Depends(get_db)):
+async def get_all_assignment_subs(
+    cred: Credentials,
+    response: Response,
+    page: PageQuery,
+    db: AsyncSession = Depends(get_db),
+):
     verify_testing(cred)  # Raises HTTPException (401) on failure
 
-    return crud_admin.get_all_assignment_subs(db)
+    if page.format == "ndjson":
+        return await pagination.ndjson_response(
+            lambda db, cursor, limit: crud_admin.get_all_assignment_subs(
+                db=db, cursor=cursor, limit=limit
+            ),
+            cursor=page.cursor,
+        )
+
+    return pagination.page_items(
+        response,
+        await crud_admin.get_all_assignment_subs(
+            db, cursor=page.cursor, limit=page.limit
+        ),
+    )
 
 
 @app.get("/testing/get-all-grades", response_model=list[schemas.StudentGrades])
-async def get_all_grades(cred: Credentials, db: Session = Depends(get_db)):
+async def get_all_grades(cred: Credentials):
     verify_testing(cred)  # Raises HTTPException (401) on failure
 
-    student_grades = crud_admin.get_student_grades(db)
+    async def generate_rows():
+        # The response outlives the request's dependencies, so use a session of its
+        # own for the duration of the stream
+        async with AsyncSessionLocal() as db:
+            assignment_list = await crud_admin.get_graded_assignments(db)
+
+            output = StringIO()
+            writer = csv.writer(output)
+
+            def flush() -> str:
+                text = output.getvalue()
+                output.seek(0)
+                output.truncate()
+                return text
 
-    assignment_set: set[str] = set()
-    for student in student_grades:
-        assignment_set.update(student.grades.keys())
+            writer.writerow(["Username"] + assignment_list)
+            yield flush()
 
-    assignment_list = list(assignment_set)
-    assignment_list.sort()
+            async for row in crud_admin.stream_gradebook(db, assignment_list):
+                writer.writerow(row)
 
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["Username"] + assignment_list)
+                # Send rows in chunks, rather than one tiny write per student
+                if output.tell() >= 64 * 1024:
+                    yield flush()
 
-    for student in student_grades:
-        row: list[str | float] = [student.student_email]
-        for assignment_name in assignment_list:
-            row.append(student.grades.get(assignment_name, 0.0))
-        writer.writerow(row)
+            yield flush()
 
-    output.seek(0)
-    response = StreamingResponse(output, media_type="text/csv")
+    response = StreamingResponse(generate_rows(), media_type="text/csv")
     response.headers["Content-Disposition"] = "attachment; filename=student_grades.csv"
 
     return response
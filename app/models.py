@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, LargeBinary, func
+from sqlalchemy import DateTime, ForeignKey, Index, LargeBinary, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .db import Base
@@ -22,6 +22,11 @@ class Student(Base):
     lecture_section: Mapped[Optional[int]] = mapped_column(index=True)
     lab_section: Mapped[Optional[int]] = mapped_column(index=True)
 
+    __table_args__ = (
+        # Serves keyset pagination of the student list
+        Index("ix_students_family_name_id", "family_name", "id"),
+    )
+
 
 #
 # Assignments/notebooks
@@ -51,6 +56,16 @@ class Assignment(Base):
     max_score: Mapped[float]
     due_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
 
+    __table_args__ = (
+        # Covers the max score/due date lookup when scoring a submission
+        Index(
+            "ix_assignments_week_number_assignment_type",
+            "week_number",
+            "assignment_type",
+            postgresql_include=["max_score", "due_date"],
+        ),
+    )
+
 
 class AssignmentSubmission(Base):
     __tablename__ = "assignment_submissions"
@@ -72,6 +87,48 @@ class AssignmentSubmission(Base):
     updated_score: Mapped[Optional[float]]
     key_used: Mapped[Optional[str]]
 
+    __table_args__ = (
+        # Finds a student's best submission without sorting
+        Index(
+            "ix_assignment_submissions_student_email_assignment_score",
+            "student_email",
+            "assignment",
+            "submitted_score",
+        ),
+        # Covers the per-week best scores of get_assignment_grades
+        Index(
+            "ix_assignment_submissions_assignment_week_number",
+            "assignment",
+            "week_number",
+            "student_email",
+            postgresql_include=["current_max_score"],
+        ),
+    )
+
+
+# Best scores per student and assignment, maintained alongside
+# assignment_submissions so that grade reads don't have to aggregate over it
+class StudentBestScore(Base):
+    __tablename__ = "student_best_scores"
+
+    student_email: Mapped[str] = mapped_column(primary_key=True)
+    assignment: Mapped[str] = mapped_column(primary_key=True)
+    week_number: Mapped[Optional[int]]
+    best_score: Mapped[float]  # Max of submitted_score
+    current_max_score: Mapped[float]  # Max of current_max_score
+    updated: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_student_best_scores_assignment_week_number",
+            "assignment",
+            "week_number",
+            postgresql_include=["current_max_score"],
+        ),
+    )
+
 
 class StudentsCompletedAssignments(Base):
     __tablename__ = "students_completed_assignments"
@@ -87,12 +144,22 @@ class StudentsCompletedAssignments(Base):
     student_seed: Mapped[int]
     key_used: Mapped[Optional[str]]
 
+    __table_args__ = (
+        # Checked on every submission, to refuse resubmission of final versions
+        Index(
+            "ix_students_completed_assignments_email_type_week",
+            "student_email",
+            "assignment_type",
+            "week_number",
+        ),
+    )
+
 
 class Notebook(Base):
     __tablename__ = "notebooks"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    title: Mapped[str]
+    title: Mapped[str] = mapped_column(index=True, unique=True)
     week_number: Mapped[Optional[int]]
     assignment_type: Mapped[Optional[str]]
     due_date: Mapped[datetime]
@@ -193,10 +260,27 @@ class Token(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     value: Mapped[str] = mapped_column(index=True, unique=True)
     created: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    expires: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    requester: Mapped[str]
+    student_id: Mapped[Optional[str]]
+    assignment: Mapped[Optional[str]]
+
+
+# Tokens moved out of the tokens table by the reaper, some time after they expired,
+# so that the table (and its indices) hold only live tokens
+class ArchivedToken(Base):
+    __tablename__ = "archived_tokens"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    value: Mapped[str] = mapped_column(index=True)
+    created: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     expires: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     requester: Mapped[str]
     student_id: Mapped[Optional[str]]
     assignment: Mapped[Optional[str]]
+    archived: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
 
 #
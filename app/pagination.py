@@ -0,0 +1,268 @@
+"""
+pagination.py
+
+This module provides keyset (cursor-based) pagination for the list endpoints, and
+NDJSON streaming for full dumps.
+
+A page is fetched with WHERE (keys) > (last row's keys) ORDER BY keys LIMIT n, so
+fetching page 1,000 costs the same as fetching page 1, unlike OFFSET (given an index on
+the keys). Keys must identify rows uniquely (e.g., end with the primary key), and are
+compared in ascending order with NULLs last, which is Postgres's default. The client sees the last row's keys only as an
+opaque cursor, which it passes back to get the next page.
+
+Functions:
+    - encode_cursor(values: Sequence[Any]) -> str:
+        Encodes a row's key values as an opaque cursor.
+
+    - decode_cursor(cursor: str, size: int) -> list[Any]:
+        Decodes a cursor, raising HTTPException (400) if it is not valid.
+
+    - paginate(db: AsyncSession, stmt: Select, keys: Sequence[Any], ...) -> Page:
+        Fetches the page of stmt's results that follows the cursor.
+
+    - page_items(response: Response, page: Page) -> Sequence:
+        Sets the X-Next-Cursor header from a page, and returns its rows.
+
+    - ndjson_response(fetch_page: PageFetcher, serialize: Callable, ...) -> StreamingResponse:
+        Streams every page, one JSON document per line.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Literal,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, and_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .db import AsyncSessionLocal
+
+#
+# Consts
+#
+
+# Rows fetched per query when streaming a full dump
+NDJSON_PAGE_SIZE = 1000
+
+# Carries the next page's cursor, so that response bodies stay plain lists
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+#
+# Types
+#
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """
+    One page of a list endpoint's results.
+
+    Attributes:
+        items (Sequence[T]): The rows on this page.
+        next_cursor (Optional[str]): Pass as cursor to get the next page; None if this
+            is the last page.
+    """
+
+    items: Sequence[T]
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class PageParams:
+    """
+    Query parameters shared by the paginated list endpoints (use with Depends()).
+
+    Attributes:
+        cursor (Optional[str]): The X-Next-Cursor header of the previous page.
+        limit (Optional[int]): The page size; None for everything after the cursor.
+        format (str): "json" for a JSON array, or "ndjson" to stream every row after
+            the cursor, one JSON document per line (limit is then ignored).
+    """
+
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the last page")
+    limit: Optional[int] = Query(None, ge=1, description="Page size (default: all)")
+    format: Literal["json", "ndjson"] = Query("json", description="json or ndjson")
+
+
+# Called with a session, a cursor, and a page size
+PageFetcher = Callable[[AsyncSession, Optional[str], int], Awaitable[Page[Any]]]
+
+#
+# Functions
+#
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encodes a row's key values (which must be JSON-serializable) as an opaque cursor.
+    """
+    data = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """
+    Decodes a cursor made by encode_cursor.
+
+    Args:
+        cursor (str): The cursor.
+        size (int): The number of key values it should hold.
+
+    Returns:
+        list[Any]: The key values.
+
+    Raises:
+        HTTPException (400): If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+    return values
+
+
+def _after(keys: Sequence[Any], values: Sequence[Any]) -> list[Any]:
+    # Rows after the cursor, as conditions for consecutive runs of the ordering. Each
+    # is a row comparison, which Postgres can answer from an index on the keys; a
+    # nullable first key needs a second run for its NULLs, which sort last
+    first, rest = keys[0], keys[1:]
+    if not first.expression.nullable:
+        return [tuple_(*keys) > tuple_(*values)]
+
+    if values[0] is None:
+        return [and_(first.is_(None), tuple_(*rest) > tuple_(*values[1:]))]
+
+    # Comparing a NULL first key yields NULL, so the first run excludes NULLs
+    return [tuple_(*keys) > tuple_(*values), first.is_(None)]
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    keys: Sequence[Any],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    key_of: Optional[Callable[[Any], Sequence[Any]]] = None,
+) -> Page[Any]:
+    """
+    Fetches the page of a query's results that follows a cursor.
+
+    Args:
+        db (AsyncSession): The database session to use for the query.
+        stmt (Select): The query, without ORDER BY or LIMIT (or OFFSET, if a cursor
+            is given).
+        keys (Sequence[Any]): The columns to order and page by. Together, they must
+            be unique, and only the first may be nullable.
+        cursor (Optional[str]): The cursor of the previous page; None to start.
+        limit (Optional[int]): The page size; None for all remaining rows.
+        key_of (Optional[Callable]): Extracts the key values from a result. Defaults
+            to reading each key as an attribute, as for ORM objects.
+
+    Returns:
+        Page: The rows, and the cursor for the next page.
+    """
+    assert not any(key.expression.nullable for key in keys[1:])
+    assert len(keys) > 1 or not keys[0].expression.nullable
+
+    runs: list[Any] = [None]
+    if cursor is not None:
+        runs = _after(keys, decode_cursor(cursor, len(keys)))
+
+    items: list[Any] = []
+    for condition in runs:
+        run = stmt if condition is None else stmt.where(condition)
+        run = run.order_by(*keys)
+        if limit is not None:
+            # One extra, to tell whether there is more
+            if len(items) > limit:
+                break
+            run = run.limit(limit + 1 - len(items))
+
+        items.extend((await db.execute(run)).scalars().all())
+
+    if limit is None or len(items) <= limit:
+        return Page(items=items)
+
+    items = items[:limit]
+    if key_of is None:
+        last = items[-1]
+        values = [getattr(last, key.key) for key in keys]
+    else:
+        values = key_of(items[-1])
+
+    return Page(items=items, next_cursor=encode_cursor(values))
+
+
+def page_items(response: Response, page: Page[T]) -> Sequence[T]:
+    """
+    Sets the X-Next-Cursor header from a page (if there is a next page), and returns
+    the page's rows, to be returned from an endpoint.
+    """
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+    return page.items
+
+
+async def ndjson_response(
+    fetch_page: PageFetcher,
+    serialize: Callable[[Any], Any] = lambda item: item,
+    cursor: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Streams every row after a cursor as NDJSON, one JSON document per line.
+
+    Rows are fetched NDJSON_PAGE_SIZE at a time, each page with a session of its own,
+    so that neither the rows nor a connection are held while the client reads. The
+    first page is fetched before the response starts, so that a bad cursor is still
+    reported as an error.
+
+    Args:
+        fetch_page (PageFetcher): Fetches one page (e.g., a crud_admin list function).
+        serialize (Callable): Converts a row to what the JSON endpoint would return.
+        cursor (Optional[str]): Where to start; None for the beginning.
+
+    Returns:
+        StreamingResponse: The application/x-ndjson response.
+    """
+    async with AsyncSessionLocal() as db:
+        first_page = await fetch_page(db, cursor, NDJSON_PAGE_SIZE)
+
+    async def generate_lines():
+        page = first_page
+        while True:
+            yield "".join(
+                json.dumps(jsonable_encoder(serialize(item))) + "\n"
+                for item in page.items
+            )
+
+            if page.next_cursor is None:
+                return
+
+            async with AsyncSessionLocal() as db:
+                page = await fetch_page(db, page.next_cursor, NDJSON_PAGE_SIZE)
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
@@ -0,0 +1,222 @@
+"""
+reference_cache.py
+
+This module provides a read-through, in-process cache of the assignments and notebooks
+tables. Both are tiny and change only when an admin edits them, but are consulted on
+every submission; caching them keeps that metadata off the submission hot path.
+
+The whole of both tables is loaded at once, and indexed by title and by (week_number,
+assignment_type). Entries expire after REFERENCE_CACHE_TTL seconds, and are dropped
+immediately by invalidate(), which the admin CRUD functions call after any change. They
+also publish "reference" on the invalidation bus, so that other replicas do the same.
+
+Functions:
+    - get_reference_data(db: AsyncSession) -> ReferenceData:
+        Returns the cached reference data, loading it first if needed.
+
+    - invalidate() -> None:
+        Drops the cached reference data, so that the next read reloads it.
+
+Environment Variables:
+- REFERENCE_CACHE_TTL: Seconds before cached reference data is reloaded (default 60;
+  0 disables caching).
+"""
+
+import asyncio
+import datetime
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import invalidation, models
+
+#
+# Environment variables
+#
+
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL") or 60)
+
+#
+# Types
+#
+
+
+@dataclass(frozen=True)
+class AssignmentRef:
+    title: str
+    week_number: Optional[int]
+    assignment_type: Optional[str]
+    max_score: float
+    due_date: datetime.datetime
+
+
+@dataclass(frozen=True)
+class NotebookRef:
+    title: str
+    week_number: Optional[int]
+    assignment_type: Optional[str]
+    max_score: float
+    due_date: datetime.datetime
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    """
+    A snapshot of the assignments and notebooks tables.
+
+    Attributes:
+        assignments (dict[str, AssignmentRef]): Assignments by title.
+        notebooks (dict[str, NotebookRef]): Notebooks by title.
+        by_week_and_type (dict[tuple[int, str], tuple[float, datetime.datetime]]):
+            The maximum max_score and latest due_date across assignments, by
+            (week_number, assignment_type).
+        loaded_at (float): When the snapshot was loaded (time.monotonic()).
+    """
+
+    assignments: dict[str, AssignmentRef] = field(default_factory=dict)
+    notebooks: dict[str, NotebookRef] = field(default_factory=dict)
+    by_week_and_type: dict[
+        tuple[Optional[int], Optional[str]], tuple[float, datetime.datetime]
+    ] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    def max_score_and_due_date(
+        self, week_number: int, assignment_type: str
+    ) -> tuple[Optional[float], Optional[datetime.datetime]]:
+        """
+        Returns the same values as get_max_score_and_due_date_by_week_and_type.
+        """
+        return self.by_week_and_type.get((week_number, assignment_type), (None, None))
+
+    def notebook_max_score(self, notebook_title: str) -> Optional[float]:
+        """
+        Returns the same value as get_notebook_max_score_by_notebook.
+        """
+        notebook = self.notebooks.get(notebook_title)
+        return notebook.max_score if notebook else None
+
+
+#
+# State
+#
+
+_cached: Optional[ReferenceData] = None
+_generation = 0  # Bumped by invalidate(), so that loads in flight are discarded
+_load_lock = asyncio.Lock()
+
+#
+# Functions
+#
+
+
+async def _load(db: AsyncSession) -> ReferenceData:
+    # Ordered by ID, so that the first row wins when titles are duplicated
+    assignments = (
+        (await db.execute(select(models.Assignment).order_by(models.Assignment.id)))
+        .scalars()
+        .all()
+    )
+    notebooks = (
+        (await db.execute(select(models.Notebook).order_by(models.Notebook.id)))
+        .scalars()
+        .all()
+    )
+
+    data = ReferenceData(loaded_at=time.monotonic())
+
+    for assignment in assignments:
+        data.assignments.setdefault(
+            assignment.title,
+            AssignmentRef(
+                title=assignment.title,
+                week_number=assignment.week_number,
+                assignment_type=assignment.assignment_type,
+                max_score=assignment.max_score,
+                due_date=assignment.due_date,
+            ),
+        )
+
+        key = (assignment.week_number, assignment.assignment_type)
+        if key in data.by_week_and_type:
+            max_score, due_date = data.by_week_and_type[key]
+            data.by_week_and_type[key] = (
+                max(max_score, assignment.max_score),
+                max(due_date, assignment.due_date),
+            )
+        else:
+            data.by_week_and_type[key] = (assignment.max_score, assignment.due_date)
+
+    for notebook in notebooks:
+        data.notebooks.setdefault(
+            notebook.title,
+            NotebookRef(
+                title=notebook.title,
+                week_number=notebook.week_number,
+                assignment_type=notebook.assignment_type,
+                max_score=notebook.max_score,
+                due_date=notebook.due_date,
+            ),
+        )
+
+    return data
+
+
+def _is_fresh(data: Optional[ReferenceData]) -> bool:
+    return data is not None and time.monotonic() - data.loaded_at < REFERENCE_CACHE_TTL
+
+
+async def get_reference_data(db: AsyncSession) -> ReferenceData:
+    """
+    Returns the cached assignments and notebooks, loading them first if the cache is
+    empty, expired, or has been invalidated.
+
+    Concurrent misses share a single load.
+
+    Args:
+        db (AsyncSession): The database session to load with, on a miss.
+
+    Returns:
+        ReferenceData: The current snapshot. Treat it as read-only.
+    """
+    global _cached
+
+    if REFERENCE_CACHE_TTL <= 0:
+        return await _load(db)
+
+    data = _cached
+    if _is_fresh(data):
+        assert data is not None
+        return data
+
+    async with _load_lock:
+        # Another request may have loaded while we waited
+        data = _cached
+        if _is_fresh(data):
+            assert data is not None
+            return data
+
+        generation = _generation
+        data = await _load(db)
+
+        # Don't cache a snapshot that was already stale when it finished loading
+        if generation == _generation:
+            _cached = data
+
+        return data
+
+
+def invalidate() -> None:
+    """
+    Drops the cached reference data, so that the next read reloads it.
+    """
+    global _cached, _generation
+
+    _generation += 1
+    _cached = None
+
+
+invalidation.subscribe("reference", lambda key: invalidate())
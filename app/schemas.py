@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel
 
@@ -14,6 +14,15 @@ class QuestionScoreFinal:
     max_score: int
 
 
+@dataclass
+class SubmissionContext:
+    already_completed: bool
+    assignment_max_score: Optional[float]
+    assignment_due_date: Optional[datetime]
+    notebook_max_score: Optional[float]
+    current_best: Optional[float]
+
+
 class Assignment(BaseModel):
     title: str
     description: Optional[str] = None
@@ -58,6 +67,15 @@ class ScoringSubmission(BaseModel):
     responses: dict
 
 
+class ScoringResult(BaseModel):
+    term: str
+    week: str
+    assignment: str
+    question: str
+    scores: Optional[dict[str, tuple[float, float]]] = None
+    error: Optional[str] = None
+
+
 class Student(BaseModel):
     email: str
     family_name: Optional[str] = None
@@ -83,6 +101,16 @@ class TokenRequest(BaseModel):
     assignment: Optional[str] = None
 
 
+class TokenBatchRequest(BaseModel):
+    assignment: str
+    duration: int = 120
+    requester: str = "admin"
+    # Either a list of students, or a lecture and/or lab section
+    student_emails: Optional[list[str]] = None
+    lecture_section: Optional[int] = None
+    lab_section: Optional[int] = None
+
+
 class Question(BaseModel):
     title: str
     assignment: str
@@ -154,6 +182,35 @@ class GradeUpdateRequest(BaseModel):
     updated_score: float
 
 
+class GradeUpdateError(BaseModel):
+    record: int  # Numbered from 1, as in the upload
+    student_email: str
+    assignment: str
+    detail: str
+
+
+class BulkGradeUpdateResult(BaseModel):
+    updated: int
+    errors: list[GradeUpdateError]
+
+
+class BulkUpsertResult(BaseModel):
+    inserted: int
+    updated: int
+    unchanged: int
+
+
+class FieldChange(BaseModel):
+    old: Any
+    new: Any
+
+
+class ScheduleUpsertResult(BaseModel):
+    inserted: list[str]  # Titles
+    updated: dict[str, dict[str, FieldChange]]  # Title -> field -> change
+    unchanged: list[str]  # Titles
+
+
 class ExecutionLogUpload(BaseModel):
     student_email: str
     assignment: str
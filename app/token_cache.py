@@ -0,0 +1,208 @@
+"""
+token_cache.py
+
+This module provides a read-through, in-process cache of tokens, by value. Tokens are
+validated on the exam-start critical path, when hundreds of students check theirs at
+the same moment; caching them keeps those checks off the database.
+
+Each entry holds a token's expiry, student_id and assignment, and is evicted when the
+token expires (or after TOKEN_CACHE_TTL seconds, if sooner). Values that aren't found,
+or whose tokens have already expired, are remembered for TOKEN_CACHE_NEGATIVE_TTL
+seconds, so that retries of a mistyped value don't each reach the database. The admin
+CRUD functions call invalidate() after any change to a token, and publish "tokens" on
+the invalidation bus, so that other replicas do the same.
+
+Functions:
+    - get_token(db: AsyncSession, value: str) -> Optional[TokenRef]:
+        Returns the cached token with a value, loading it first if needed.
+
+    - invalidate(value: Optional[str] = None) -> None:
+        Drops the cached entry for a value, or every entry.
+
+Environment Variables:
+- TOKEN_CACHE_TTL: Maximum seconds a token is cached (default 300; 0 disables caching).
+- TOKEN_CACHE_NEGATIVE_TTL: Seconds an unknown or expired value is remembered
+  (default 5).
+- TOKEN_CACHE_MAX_ENTRIES: Entries kept before the soonest to expire are dropped
+  (default 50000).
+"""
+
+import asyncio
+import datetime
+import heapq
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import invalidation, models
+
+#
+# Environment variables
+#
+
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL") or 300)
+TOKEN_CACHE_NEGATIVE_TTL = float(os.getenv("TOKEN_CACHE_NEGATIVE_TTL") or 5)
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES") or 50000)
+
+#
+# Types
+#
+
+
+@dataclass(frozen=True)
+class TokenRef:
+    expires: datetime.datetime
+    student_id: Optional[str]
+    assignment: Optional[str]
+
+    def is_expired(self) -> bool:
+        return self.expires < datetime.datetime.now(datetime.UTC)
+
+    def matches(self, student_id: Optional[str], assignment: Optional[str]) -> bool:
+        """
+        Returns whether the token is valid for a student and assignment, as
+        validate_token_filters checks: a token without a student_id (or assignment)
+        is valid for any.
+        """
+        return (self.student_id is None or self.student_id == student_id) and (
+            self.assignment is None or self.assignment == assignment
+        )
+
+
+@dataclass(frozen=True)
+class _Entry:
+    token: Optional[TokenRef]  # None if not found
+    deadline: datetime.datetime  # When to evict
+
+
+#
+# State
+#
+
+_entries: dict[str, _Entry] = {}
+# (deadline, value), soonest first; entries replaced or dropped since are skipped
+_deadlines: list[tuple[datetime.datetime, str]] = []
+_generation = 0  # Bumped by invalidate(), so that loads in flight are discarded
+_loading: dict[str, asyncio.Future[None]] = {}  # Loads in flight, by value
+
+#
+# Functions
+#
+
+
+async def _load(db: AsyncSession, value: str) -> Optional[TokenRef]:
+    stmt = select(
+        models.Token.expires, models.Token.student_id, models.Token.assignment
+    ).where(models.Token.value == value)
+    row = (await db.execute(stmt)).one_or_none()
+
+    if row is None:
+        return None
+
+    return TokenRef(
+        expires=row.expires, student_id=row.student_id, assignment=row.assignment
+    )
+
+
+def _evict(now: datetime.datetime) -> None:
+    # Drop every entry past its deadline, and the soonest to expire while full
+    while _deadlines and (
+        _deadlines[0][0] <= now or len(_entries) >= TOKEN_CACHE_MAX_ENTRIES
+    ):
+        deadline, value = heapq.heappop(_deadlines)
+        entry = _entries.get(value)
+        if entry is not None and entry.deadline == deadline:
+            del _entries[value]
+
+
+def _store(value: str, token: Optional[TokenRef], now: datetime.datetime) -> None:
+    if token is None or token.is_expired():
+        ttl = TOKEN_CACHE_NEGATIVE_TTL
+    else:
+        ttl = TOKEN_CACHE_TTL
+
+    deadline = now + datetime.timedelta(seconds=ttl)
+    if token is not None and token.expires > now:
+        deadline = min(deadline, token.expires)
+
+    _evict(now)
+    _entries[value] = _Entry(token=token, deadline=deadline)
+    heapq.heappush(_deadlines, (deadline, value))
+
+    # Invalidated and reloaded entries leave their old deadlines behind
+    if len(_deadlines) > 2 * len(_entries) + 1000:
+        _deadlines[:] = [(e.deadline, v) for v, e in _entries.items()]
+        heapq.heapify(_deadlines)
+
+
+async def get_token(db: AsyncSession, value: str) -> Optional[TokenRef]:
+    """
+    Returns the cached token with a value, loading it first if it isn't cached (or
+    has been evicted or invalidated).
+
+    Concurrent misses for the same value share a single load.
+
+    Args:
+        db (AsyncSession): The database session to load with, on a miss.
+        value (str): The token's value.
+
+    Returns:
+        Optional[TokenRef]: The token, expired or not; None if there is none with
+        that value.
+    """
+    if TOKEN_CACHE_TTL <= 0:
+        return await _load(db, value)
+
+    while True:
+        now = datetime.datetime.now(datetime.UTC)
+        entry = _entries.get(value)
+        if entry is not None and entry.deadline > now:
+            return entry.token
+
+        loading = _loading.get(value)
+        if loading is None:
+            break
+
+        # Wait for the load in flight, then look again (it may have been discarded)
+        await asyncio.wait([loading])
+
+    loading = asyncio.get_running_loop().create_future()
+    _loading[value] = loading
+
+    try:
+        generation = _generation
+        token = await _load(db, value)
+
+        # Don't cache a token that was already stale when it finished loading
+        if generation == _generation:
+            _store(value, token, datetime.datetime.now(datetime.UTC))
+
+        return token
+    finally:
+        del _loading[value]
+        loading.set_result(None)
+
+
+def invalidate(value: Optional[str] = None) -> None:
+    """
+    Drops the cached entry for a token value (e.g., after the token is created,
+    updated or deleted), so that the next read reloads it.
+
+    Args:
+        value (Optional[str]): The token's value; None to drop every entry.
+    """
+    global _generation
+
+    _generation += 1
+
+    if value is None:
+        _entries.clear()
+        _deadlines.clear()
+    else:
+        _entries.pop(value, None)
+
+
+invalidation.subscribe("tokens", invalidate)
@@ -0,0 +1,143 @@
+"""
+token_reaper.py
+
+This module provides a background task that moves expired tokens out of the tokens
+table, into archived_tokens, so that listing and validating tokens only touches live
+ones (and those expired within TOKEN_REAPER_GRACE, which validation still reports as
+expired rather than unknown).
+
+Every replica runs the task, but each run first takes a Postgres advisory lock, so that
+only one replica reaps at a time; the others skip that run. Tokens are moved in batches
+of TOKEN_REAPER_BATCH_SIZE, each in a transaction of its own, so that locks are held
+briefly.
+
+Functions:
+    - reap_expired_tokens() -> Optional[int]:
+        Archives every token expired for longer than the grace period.
+
+    - run_reaper(interval: float) -> None:
+        Calls reap_expired_tokens every `interval` seconds until cancelled.
+
+Environment Variables:
+- TOKEN_REAPER_INTERVAL: Seconds between runs (default 3600; 0 disables the reaper).
+- TOKEN_REAPER_GRACE: Seconds after expiry before a token is archived (default 86400).
+- TOKEN_REAPER_BATCH_SIZE: Tokens archived per transaction (default 1000).
+"""
+
+import asyncio
+import datetime
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from . import models
+from .db import async_engine
+
+#
+# Environment variables
+#
+
+TOKEN_REAPER_INTERVAL = float(os.getenv("TOKEN_REAPER_INTERVAL") or 3600)
+TOKEN_REAPER_GRACE = float(os.getenv("TOKEN_REAPER_GRACE") or 86400)
+TOKEN_REAPER_BATCH_SIZE = int(os.getenv("TOKEN_REAPER_BATCH_SIZE") or 1000)
+
+#
+# Constants
+#
+
+# Identifies the reaper's advisory lock; any bigint not used for another lock
+TOKEN_REAPER_LOCK_ID = 131_000_001
+
+logger = logging.getLogger(__name__)
+
+#
+# Functions
+#
+
+
+async def reap_expired_tokens() -> Optional[int]:
+    """
+    Moves every token that expired more than TOKEN_REAPER_GRACE seconds ago into
+    archived_tokens, in batches.
+
+    Reaped tokens need not be evicted from the token cache, which keeps expired tokens
+    only as long as unknown values (TOKEN_CACHE_NEGATIVE_TTL).
+
+    Returns:
+        Optional[int]: The number of tokens archived; None if another replica holds
+        the lock.
+    """
+    tokens = models.Token.__table__
+    archive = models.ArchivedToken.__table__
+    columns = [c.name for c in tokens.columns]
+
+    cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
+        seconds=TOKEN_REAPER_GRACE
+    )
+
+    # Oldest first, skipping any that a request has locked (e.g., to renew)
+    batch = (
+        select(tokens.c.id)
+        .where(tokens.c.expires < cutoff)
+        .order_by(tokens.c.expires)
+        .limit(TOKEN_REAPER_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    deleted = (
+        delete(tokens)
+        .where(tokens.c.id.in_(batch))
+        .returning(*tokens.columns)
+        .cte("deleted")
+    )
+    stmt = (
+        insert(archive)
+        .from_select(columns, select(*(deleted.c[c] for c in columns)))
+        .returning(archive.c.id)  # rowcount isn't reported through the CTE
+    )
+
+    archived = 0
+
+    # The lock belongs to the connection, so every batch runs on the same one
+    async with async_engine.connect() as conn:
+        lock_id = TOKEN_REAPER_LOCK_ID
+        locked = await conn.scalar(select(func.pg_try_advisory_lock(lock_id)))
+        await conn.commit()
+        if not locked:
+            return None
+
+        try:
+            while True:
+                count = len((await conn.execute(stmt)).all())
+                await conn.commit()
+
+                archived += count
+                if count < TOKEN_REAPER_BATCH_SIZE:
+                    break
+        finally:
+            await conn.rollback()
+            await conn.execute(select(func.pg_advisory_unlock(lock_id)))
+            await conn.commit()
+
+    return archived
+
+
+async def run_reaper(interval: float) -> None:
+    """
+    Archives expired tokens every `interval` seconds, until cancelled. A run that
+    fails on a database error is logged, and retried at the next interval.
+
+    Args:
+        interval (float): Seconds between runs.
+    """
+    while True:
+        try:
+            archived = await reap_expired_tokens()
+            if archived:
+                logger.info("Archived %d expired tokens", archived)
+        except SQLAlchemyError:
+            logger.exception("Failed to archive expired tokens")
+
+        await asyncio.sleep(interval)
@@ -0,0 +1,157 @@
+"""
+workers.py
+
+This module provides a bounded thread pool for CPU-bound work (password hashing, log
+decryption and parsing) that would otherwise stall the event loop, along with counters
+for sizing the pool.
+
+Functions:
+    - run_cpu(fn: Callable[..., T], *args: Any) -> T:
+        Runs a function on the pool and awaits its result.
+
+    - get_stats() -> WorkerStats:
+        Returns a snapshot of the pool's queue depth and wait times.
+
+Environment Variables:
+- CPU_WORKERS: Number of worker threads (default 4).
+- CPU_QUEUE_LIMIT: Maximum number of jobs waiting for a worker before new jobs are
+  rejected with 503 (default 64).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+T = TypeVar("T")
+
+#
+# Environment variables
+#
+
+CPU_WORKERS = int(os.getenv("CPU_WORKERS") or 4)
+CPU_QUEUE_LIMIT = int(os.getenv("CPU_QUEUE_LIMIT") or 64)
+
+#
+# Types
+#
+
+
+@dataclass
+class WorkerStats:
+    """
+    A snapshot of the CPU worker pool.
+
+    Attributes:
+        workers (int): The number of worker threads.
+        queue_limit (int): The maximum number of jobs allowed to wait.
+        queued (int): Jobs submitted but not yet started.
+        running (int): Jobs currently running.
+        completed (int): Jobs finished since startup.
+        cancelled (int): Jobs dropped because their caller was cancelled (e.g., the
+            client disconnected) before a worker started them.
+        rejected (int): Jobs turned away because the queue was full.
+        total_wait_seconds (float): Time completed jobs spent waiting for a worker.
+        max_wait_seconds (float): Longest time any job spent waiting for a worker.
+    """
+
+    workers: int
+    queue_limit: int
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    rejected: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+#
+# State
+#
+
+_executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="cpu")
+_stats = WorkerStats(workers=CPU_WORKERS, queue_limit=CPU_QUEUE_LIMIT)
+_lock = threading.Lock()
+
+#
+# Functions
+#
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Runs a function on the CPU worker pool and awaits its result.
+
+    Exceptions raised by the function propagate to the caller unchanged. If the caller
+    is cancelled before a worker starts the job, the job is dropped; once started, it
+    runs to completion.
+
+    Args:
+        fn (Callable[..., T]): The function to run.
+        *args (Any): Positional arguments for the function.
+
+    Returns:
+        T: The function's return value.
+
+    Raises:
+        HTTPException: If the queue is already at CPU_QUEUE_LIMIT (503).
+    """
+    with _lock:
+        if _stats.queued >= CPU_QUEUE_LIMIT:
+            _stats.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy; please try again shortly",
+            )
+        _stats.queued += 1
+
+    enqueued = time.monotonic()
+    started = False
+    dropped = False
+
+    def job() -> T:
+        nonlocal started
+        waited = time.monotonic() - enqueued
+        with _lock:
+            # The caller was cancelled, and has already left the queue
+            if dropped:
+                raise asyncio.CancelledError()
+            started = True
+            _stats.queued -= 1
+            _stats.running += 1
+            _stats.total_wait_seconds += waited
+            _stats.max_wait_seconds = max(_stats.max_wait_seconds, waited)
+
+        try:
+            return fn(*args)
+        finally:
+            with _lock:
+                _stats.running -= 1
+                _stats.completed += 1
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, job)
+    finally:
+        # A job cancelled before it starts never runs, so leave the queue here
+        with _lock:
+            if not started and not dropped:
+                dropped = True
+                _stats.queued -= 1
+                _stats.cancelled += 1
+
+
+def get_stats() -> WorkerStats:
+    """
+    Returns a snapshot of the CPU worker pool.
+
+    Returns:
+        WorkerStats: A copy of the current counters.
+    """
+    with _lock:
+        return WorkerStats(**vars(_stats))
@@ -0,0 +1,98 @@
+import argparse
+import sys
+
+from sqlalchemy import text
+
+from app.db import engine
+
+#
+# Consts
+#
+
+# Best scores as computed from scratch, the way the backfill migration does it
+EXPECTED_SQL = """
+    SELECT
+        student_email,
+        assignment,
+        (array_agg(week_number ORDER BY id DESC))[1] AS week_number,
+        max(submitted_score) AS best_score,
+        max(current_max_score) AS current_max_score
+    FROM assignment_submissions
+    GROUP BY student_email, assignment
+"""
+
+MISMATCH_SQL = f"""
+    SELECT
+        coalesce(e.student_email, s.student_email) AS student_email,
+        coalesce(e.assignment, s.assignment) AS assignment,
+        e.best_score AS expected_best,
+        s.best_score AS stored_best,
+        e.current_max_score AS expected_max,
+        s.current_max_score AS stored_max,
+        e.week_number AS expected_week,
+        s.week_number AS stored_week
+    FROM ({EXPECTED_SQL}) AS e
+    FULL OUTER JOIN student_best_scores AS s
+        ON s.student_email = e.student_email AND s.assignment = e.assignment
+    WHERE e.best_score IS DISTINCT FROM s.best_score
+        OR e.current_max_score IS DISTINCT FROM s.current_max_score
+        OR e.week_number IS DISTINCT FROM s.week_number
+    ORDER BY 1, 2
+"""
+
+REBUILD_SQL = f"""
+    INSERT INTO student_best_scores
+        (student_email, assignment, week_number, best_score, current_max_score)
+    {EXPECTED_SQL}
+"""
+
+#
+# Functions
+#
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Check student_best_scores against assignment_submissions"
+    )
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Rebuild student_best_scores from assignment_submissions if they differ",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    with engine.begin() as conn:
+        mismatches = conn.execute(text(MISMATCH_SQL)).all()
+
+        for row in mismatches:
+            print(
+                f"{row.student_email} / {row.assignment}: "
+                f"expected best {row.expected_best} (max {row.expected_max}, "
+                f"week {row.expected_week}), "
+                f"stored {row.stored_best} (max {row.stored_max}, "
+                f"week {row.stored_week})"
+            )
+
+        if not mismatches:
+            print("student_best_scores is consistent")
+            return
+
+        print(f"Found {len(mismatches)} inconsistent rows")
+
+        if not args.fix:
+            sys.exit(1)
+
+        # Lock out concurrent upserts while rebuilding
+        conn.execute(text("LOCK TABLE student_best_scores IN EXCLUSIVE MODE"))
+        conn.execute(text("DELETE FROM student_best_scores"))
+        conn.execute(text(REBUILD_SQL))
+        print("Rebuilt student_best_scores")
+
+
+if __name__ == "__main__":
+    main()
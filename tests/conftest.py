@@ -0,0 +1,86 @@
+"""
+Shared fixtures for the tests.
+
+Tests that need a database skip unless DATABASE_URL is set, and expect it to be
+migrated to the latest revision (alembic upgrade head). Their work is rolled back
+when they finish, so they may be run against a database that holds real data.
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+import pytest
+
+T = TypeVar("T")
+
+
+def _require_database() -> None:
+    if not os.getenv("DATABASE_URL"):
+        pytest.skip("DATABASE_URL is not set")
+
+
+@pytest.fixture
+def run_in_rollback() -> Callable[[Callable[[Any], Awaitable[T]]], T]:
+    """
+    Returns a function that runs a coroutine function on a fresh event loop, passing
+    it an AsyncSession whose work (commits included) is rolled back afterward.
+    """
+    _require_database()
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app import reference_cache, token_cache
+    from app.db import async_engine
+
+    def run(fn: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async def main() -> T:
+            try:
+                async with async_engine.connect() as conn:
+                    outer = await conn.begin()
+                    try:
+                        # Commits within fn release savepoints, not the transaction
+                        async with AsyncSession(
+                            bind=conn,
+                            join_transaction_mode="create_savepoint",
+                            autoflush=False,
+                            expire_on_commit=False,
+                        ) as db:
+                            return await fn(db)
+                    finally:
+                        await outer.rollback()
+            finally:
+                # Pooled connections belong to this event loop
+                await async_engine.dispose()
+                # Nor should rolled-back rows outlive the test in the caches
+                reference_cache.invalidate()
+                token_cache.invalidate()
+
+        return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def statements() -> Iterator[list[tuple[str, Any]]]:
+    """
+    Collects the (statement, parameters) of everything the app's async engine sends
+    to the database while the test runs, savepoints excepted.
+    """
+    _require_database()
+
+    from sqlalchemy import event
+
+    from app.db import async_engine
+
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE")):
+            captured.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield captured
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
@@ -0,0 +1,57 @@
+"""
+Tests for reading bulk uploads.
+"""
+
+import asyncio
+import io
+import json
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app import bulk, schemas
+
+
+def upload(filename: str, content: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+def read(filename: str, content: bytes) -> tuple[list[schemas.Student], set[str]]:
+    return asyncio.run(bulk.read_upload(upload(filename, content), schemas.Student))
+
+
+def test_reads_json_fields() -> None:
+    records = [
+        {"email": "a@drexel.edu", "given_name": "Ada"},
+        {"email": "b@drexel.edu", "given_name": None},
+    ]
+
+    students, fields = read("roster.json", json.dumps(records).encode())
+
+    assert [s.email for s in students] == ["a@drexel.edu", "b@drexel.edu"]
+    assert fields == {"email", "given_name"}
+
+
+def test_reads_csv_fields() -> None:
+    content = b"\xef\xbb\xbfemail,lab_section\na@drexel.edu,\nb@drexel.edu,2\n"
+
+    students, fields = read("roster.csv", content)
+
+    assert [s.lab_section for s in students] == [None, 2]
+    assert fields == {"email", "lab_section"}
+
+
+def test_rejects_json_records_with_different_fields() -> None:
+    # Were the second record upserted with given_name, it would be set to null
+    records = [
+        {"email": "a@drexel.edu", "given_name": "Ada"},
+        {"email": "b@drexel.edu"},
+    ]
+
+    with pytest.raises(HTTPException) as e:
+        read("roster.json", json.dumps(records).encode())
+
+    assert e.value.status_code == 422
+    assert e.value.detail == [
+        "Record 2: fields differ from earlier records' (given_name)"
+    ]
@@ -0,0 +1,170 @@
+"""
+Checks the admin grade lookups against straightforward versions of them, on seeded
+submissions.
+"""
+
+import datetime
+import os
+import random
+
+import pytest
+
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app import crud_admin, crud_student, models, schemas  # noqa: E402
+
+DUE = datetime.datetime(2030, 1, 6, tzinfo=datetime.UTC)
+PREFIX = "test-grades-"
+
+
+async def seed(db) -> None:
+    """
+    Adds assignments, and submissions to them with frequent ties on
+    current_max_score, some of which don't match their assignment's week.
+    """
+    rng = random.Random(131)
+
+    await db.execute(
+        insert(models.Assignment),
+        [
+            {
+                "title": f"{PREFIX}a{n}",
+                "week_number": 90 + n % 5,
+                "assignment_type": "lab",
+                "max_score": 5.0,
+                "due_date": DUE,
+            }
+            for n in range(8)
+        ],
+    )
+
+    submissions = []
+    for _ in range(600):
+        n = rng.randrange(10)  # Two titles have no assignment
+        score = float(rng.randrange(5))
+        submissions.append(
+            {
+                "student_email": f"{PREFIX}s{rng.randrange(30)}@drexel.edu",
+                "assignment": f"{PREFIX}a{n}",
+                "week_number": 90 + n % 5 if rng.random() > 0.1 else 99,
+                "assignment_type": "lab",
+                "student_seed": 1,
+                "due_date": DUE,
+                "raw_score": score,
+                "late_assignment_percentage": 100.0,
+                "submitted_score": score,
+                "current_max_score": score,
+            }
+        )
+    await db.execute(insert(models.AssignmentSubmission), submissions)
+
+
+async def best_submissions_by_loop(db) -> dict[str, list[int]]:
+    """
+    get_grades_testing as it was: a query per assignment, then a pass over its
+    submissions keeping the first with the highest current_max_score.
+    """
+    best: dict[tuple[str, str], models.AssignmentSubmission] = {}
+
+    for assignment in (await db.execute(select(models.Assignment))).scalars():
+        stmt = (
+            select(models.AssignmentSubmission)
+            .where(
+                models.AssignmentSubmission.assignment == assignment.title,
+                models.AssignmentSubmission.week_number == assignment.week_number,
+            )
+            .order_by(models.AssignmentSubmission.id)
+        )
+        for submission in (await db.execute(stmt)).scalars():
+            key = (submission.student_email, submission.assignment)
+            if (
+                key not in best
+                or best[key].current_max_score < submission.current_max_score
+            ):
+                best[key] = submission
+
+    by_student: dict[str, list[int]] = {}
+    for (student_email, _), submission in sorted(best.items()):
+        by_student.setdefault(student_email, []).append(submission.id)
+    return by_student
+
+
+def test_get_grades_testing_matches_loop(run_in_rollback, statements) -> None:
+    async def compare(db):
+        await seed(db)
+
+        expected = await best_submissions_by_loop(db)
+
+        statements.clear()
+        grades = await crud_admin.get_grades_testing(db, batch_size=50)
+        queries = len(statements)
+
+        actual = {
+            student_email: [submission.id for submission in submissions]
+            for student_email, submissions in grades.items()
+        }
+        return expected, actual, queries
+
+    expected, actual, queries = run_in_rollback(compare)
+
+    def seeded(grades: dict[str, list[int]]) -> dict[str, list[int]]:
+        return {email: ids for email, ids in grades.items() if email.startswith(PREFIX)}
+
+    assert seeded(expected)  # The seed produced best submissions to compare
+    assert seeded(actual) == seeded(expected)
+    assert queries == 1
+
+
+def test_get_assignment_grades_is_per_week(run_in_rollback) -> None:
+    def submission(student: str, week_number: int, score: float):
+        return schemas.AssignmentSubmission(
+            student_email=f"{PREFIX}{student}@drexel.edu",
+            assignment=f"{PREFIX}quiz",
+            week_number=week_number,
+            assignment_type="quiz",
+            timestamp=DUE,
+            student_seed=1,
+            due_date=DUE,
+            raw_score=score,
+            late_assignment_percentage=100.0,
+            submitted_score=score,
+            current_max_score=score,
+        )
+
+    async def grades(db):
+        # s1 last submitted under week 2, scoring higher than in week 1
+        for student, week_number, score in [
+            ("s1", 1, 3.0),
+            ("s1", 1, 4.0),
+            ("s1", 2, 9.0),
+            ("s2", 1, 5.0),
+            ("s3", 2, 1.0),
+        ]:
+            await crud_student.add_submitted_assignment_score(
+                db, submission(student, week_number, score)
+            )
+
+        # As the endpoint computed it before student_best_scores
+        stmt = (
+            select(
+                models.AssignmentSubmission.student_email,
+                func.max(models.AssignmentSubmission.current_max_score),
+            )
+            .where(
+                models.AssignmentSubmission.week_number == 1,
+                models.AssignmentSubmission.assignment == f"{PREFIX}quiz",
+            )
+            .group_by(models.AssignmentSubmission.student_email)
+        )
+        expected = dict((await db.execute(stmt)).tuples().all())
+
+        actual = await crud_admin.get_assignment_grades(db, 1, f"{PREFIX}quiz")
+        return expected, actual
+
+    expected, actual = run_in_rollback(grades)
+
+    assert expected == {f"{PREFIX}s1@drexel.edu": 4.0, f"{PREFIX}s2@drexel.edu": 5.0}
+    assert {row["student_email"]: row["best_score"] for row in actual} == expected
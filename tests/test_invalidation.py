@@ -0,0 +1,77 @@
+"""
+Checks that invalidation messages published on one connection reach the handlers of a
+listener on another.
+"""
+
+import asyncio
+import json
+import os
+from collections import defaultdict
+
+import pytest
+
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from sqlalchemy import func, select  # noqa: E402
+
+from app import invalidation  # noqa: E402
+from app.db import AsyncSessionLocal, async_engine  # noqa: E402
+
+
+def test_listener_runs_handlers_for_other_replicas(monkeypatch) -> None:
+    # A channel of its own, and no handlers but the test's
+    monkeypatch.setattr(invalidation, "INVALIDATION_CHANNEL", "engr_131_test")
+    monkeypatch.setattr(invalidation, "_handlers", defaultdict(list))
+
+    received: list[str] = []
+    invalidation.subscribe("test", received.append)
+
+    async def publish(key: str) -> None:
+        async with AsyncSessionLocal() as db:
+            await invalidation.publish(db, "test", key)
+            await db.commit()
+
+    async def publish_as_other_replica(key: str) -> None:
+        payload = json.dumps({"origin": "other-replica", "topic": "test", "key": key})
+        async with AsyncSessionLocal() as db:
+            await db.execute(select(func.pg_notify("engr_131_test", payload)))
+            await db.commit()
+
+    async def scenario() -> None:
+        listener = asyncio.create_task(invalidation.listen())
+        try:
+            # The listener connects in the background; publish until it's heard
+            async with asyncio.timeout(10):
+                while not received:
+                    await publish_as_other_replica("ready")
+                    await asyncio.sleep(0.05)
+
+            # Messages arrive in order: this replica's own is skipped
+            await publish("own")
+            await publish_as_other_replica("done")
+
+            async with asyncio.timeout(10):
+                while received[-1] != "done":
+                    await asyncio.sleep(0.05)
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+            await async_engine.dispose()
+
+    asyncio.run(scenario())
+
+    assert set(received) == {"ready", "done"}
+
+
+def test_dispatch_ignores_malformed_messages(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(invalidation, "_handlers", defaultdict(list))
+
+    received: list[str] = []
+    invalidation.subscribe("test", received.append)
+
+    for payload in ["not json", "1", "null", '["test"]']:
+        asyncio.run(invalidation._dispatch(payload))
+
+    assert received == []
+    assert caplog.text.count("Ignoring malformed invalidation message") == 4
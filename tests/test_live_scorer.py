@@ -0,0 +1,62 @@
+"""
+Tests for reloading the solution registry.
+"""
+
+import asyncio
+import logging
+import shutil
+
+from app import live_scorer
+
+
+def test_reload_skips_broken_solution_modules(caplog) -> None:
+    term = live_scorer._solutions_dir() / "test_term"
+    assignment = term / "week_1" / "readings"
+    assignment.mkdir(parents=True)
+    try:
+        (assignment / "q1.py").write_text(
+            "solutions = {'q1-1': 1}\ntotal_points = [2.0]\n"
+        )
+        (assignment / "q2.py").write_text("solutions = {'q2-1': \n")
+        (assignment / "q3.py").write_text("solutions = {'q3-1': undefined}\n")
+
+        with caplog.at_level(logging.ERROR, logger="app.live_scorer"):
+            live_scorer.reload_registry()
+
+        questions = live_scorer.registry.questions
+        assert ("test_term", "week_1", "readings", "q1") in questions
+        assert ("test_term", "week_1", "readings", "q2") not in questions
+        assert ("test_term", "week_1", "readings", "q3") not in questions
+        assert [record.exc_info[0] for record in caplog.records] == [
+            SyntaxError,
+            NameError,
+        ]
+        assert "test_term.week_1.readings.q2" in caplog.records[0].getMessage()
+    finally:
+        shutil.rmtree(term)
+        live_scorer.reload_registry()
+
+
+def test_watcher_survives_failed_reload(monkeypatch, caplog) -> None:
+    attempts: list[None] = []
+
+    def fail() -> None:
+        attempts.append(None)
+        raise OSError("solutions directory unreadable")
+
+    monkeypatch.setattr(live_scorer, "_fingerprint", (-1, 0.0))
+    monkeypatch.setattr(live_scorer, "reload_registry", fail)
+
+    async def scenario() -> bool:
+        watcher = asyncio.create_task(live_scorer.watch_solutions(0.01))
+        while len(attempts) < 2:
+            await asyncio.sleep(0.01)
+        alive = not watcher.done()
+        watcher.cancel()
+        await asyncio.gather(watcher, return_exceptions=True)
+        return alive
+
+    with caplog.at_level(logging.ERROR, logger="app.live_scorer"):
+        assert asyncio.run(asyncio.wait_for(scenario(), 5))
+
+    assert caplog.records[0].exc_info[0] is OSError
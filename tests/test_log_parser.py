@@ -0,0 +1,76 @@
+"""
+Tests for the LogParser, run against small plaintext logs.
+"""
+
+from app.log_parser import LogParser
+
+WEEK_TAG = "week1-readings"
+
+LOG_LINES = [
+    "Student Info, 790, jovyan, 2024-12-27 19:40:10",
+    "total-points, 10.0, week1-readings, 1_intro, 2024-12-27 19:40:11",
+    "1_intro, q1, 2.0, 5.0, 2024-12-27 19:40:12",
+    # Lines that name no notebook being scored, and have no numeric scores
+    "Cell executed, in, cell 4, 2024-12-27 19:40:13",
+    "Kernel restarted, 2024-12-27 19:40:14",
+    "other_notebook, q1, n/a, n/a, 2024-12-27 19:40:15",
+    "1_intro, q2, 3.0, 5.0, 2024-12-27 19:40:16",
+    # A later attempt at q1 replaces the earlier one
+    "1_intro, q1, 4.5, 5.0, 2024-12-27 19:40:17",
+]
+
+
+def parse(lines: list[str]) -> dict:
+    parser = LogParser(log_lines=lines, week_tag=WEEK_TAG)
+    parser.parse_logs()
+    parser.calculate_total_scores()
+    return dict(parser.get_results())
+
+
+def test_ignores_lines_of_other_notebooks() -> None:
+    results = parse(LOG_LINES)
+
+    assert results["student_information"] == {
+        "student_id": "790",
+        "username": "jovyan",
+        "timestamp": "2024-12-27 19:40:10",
+    }
+    assert results["week_num"] == 1
+    assert results["assignment_type"] == "readings"
+    assert results["assignment_information"] == {
+        "1_intro": {
+            "latest_timestamp": "2024-12-27 19:40:17",
+            "total_score": 7.5,
+            "max_points": 10.0,
+        }
+    }
+    assert results["assignment_scores"] == {
+        "1_intro": {
+            "questions": {
+                "q1": {
+                    "score_earned": 4.5,
+                    "score_possible": 5.0,
+                    "timestamp": "2024-12-27 19:40:17",
+                },
+                "q2": {
+                    "score_earned": 3.0,
+                    "score_possible": 5.0,
+                    "timestamp": "2024-12-27 19:40:16",
+                },
+            },
+            "total_score": 7.5,
+        }
+    }
+
+
+def test_converts_only_the_most_recent_entry() -> None:
+    # An earlier, malformed entry for a question is superseded, and never converted
+    lines = [
+        "total-points, 10.0, week1-readings, 1_intro, 2024-12-27 19:40:11",
+        "1_intro, q1, pending, 5.0, 2024-12-27 19:40:12",
+        "1_intro, q1, 5.0, 5.0, 2024-12-27 19:40:13",
+    ]
+
+    results = parse(lines)
+
+    assert results["assignment_scores"]["1_intro"]["total_score"] == 5.0
@@ -0,0 +1,108 @@
+"""
+Checks that the scoring and grade lookups reach the tables they filter through index
+scans, rather than sequential scans.
+
+Sequential scans are disabled while planning, so that Postgres picks an index whenever
+one applies, however few rows the tables hold; a lookup that no index serves is still
+planned as a sequential scan.
+"""
+
+import json
+import os
+from typing import Any
+
+import pytest
+
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app import crud_admin, crud_student  # noqa: E402
+
+# Bitmap index scans name the index; the bitmap heap scans above them, the table
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+# The tables each lookup must reach through an index
+LOOKUPS = {
+    "find_best_submission_id": (
+        lambda db: crud_admin.find_best_submission_id(db, "s@drexel.edu", "hw1"),
+        {"assignment_submissions"},
+    ),
+    "get_assignment_grades": (
+        lambda db: crud_admin.get_assignment_grades(db, 1, "hw1"),
+        {"assignment_submissions"},
+    ),
+    "get_best_score": (
+        lambda db: crud_student.get_best_score(db, "s@drexel.edu", "hw1"),
+        {"student_best_scores"},
+    ),
+    "get_submission_context": (
+        lambda db: crud_student.get_submission_context(
+            db, "s@drexel.edu", "hw1", 1, "homework", "nb1"
+        ),
+        {"students_completed_assignments", "student_best_scores"},
+    ),
+    "check_completed_assignment": (
+        lambda db: crud_student.check_completed_assignment(
+            db, "s@drexel.edu", "homework", 1
+        ),
+        {"students_completed_assignments"},
+    ),
+    "get_notebook_by_title": (
+        lambda db: crud_admin.get_notebook_by_title(db, "nb1"),
+        {"notebooks"},
+    ),
+}
+
+
+def scans(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Returns every scan node of a JSON query plan.
+    """
+    nodes = [plan] if "Scan" in plan["Node Type"] else []
+    for child in plan.get("Plans", []):
+        nodes += scans(child)
+    return nodes
+
+
+@pytest.mark.parametrize("lookup", LOOKUPS)
+def test_lookup_uses_index_scans(lookup, run_in_rollback, statements) -> None:
+    call, expected = LOOKUPS[lookup]
+
+    async def explain(db) -> list[dict[str, Any]]:
+        try:
+            await call(db)
+        except HTTPException:
+            pass  # Not found; the lookup was still sent
+
+        # Reference data is read whole, and cached, so only filtered reads count
+        queries = [
+            (statement, parameters)
+            for statement, parameters in statements
+            if statement.lstrip().upper().startswith("SELECT")
+            and "WHERE" in statement.upper()
+        ]
+
+        await db.execute(text("SET LOCAL enable_seqscan = off"))
+        conn = await db.connection()
+
+        nodes = []
+        for statement, parameters in queries:
+            result = await conn.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            )
+            plan = result.scalar_one()
+            plan = plan if isinstance(plan, list) else json.loads(plan)
+            nodes += scans(plan[0]["Plan"])
+        return nodes
+
+    nodes = run_in_rollback(explain)
+
+    assert not [node for node in nodes if node["Node Type"] == "Seq Scan"]
+    assert expected <= {
+        node["Relation Name"]
+        for node in nodes
+        if node["Node Type"] in INDEX_SCANS and "Relation Name" in node
+    }
@@ -0,0 +1,109 @@
+"""
+Checks the database round trips taken to score an assignment submission.
+"""
+
+import datetime
+import os
+
+import pytest
+
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from sqlalchemy import event  # noqa: E402
+
+from app import crud_student, models, reference_cache, schemas  # noqa: E402
+
+DUE = datetime.datetime(2030, 1, 6, tzinfo=datetime.UTC)
+NOW = datetime.datetime(2030, 1, 1, tzinfo=datetime.UTC)
+
+
+def submission(model, **fields):
+    return model(
+        student_email="test-scoring@drexel.edu",
+        week_number=99,
+        assignment_type="readings",
+        timestamp=NOW,
+        student_seed=1,
+        due_date=DUE,
+        raw_score=8.0,
+        late_assignment_percentage=100.0,
+        submitted_score=8.0,
+        current_max_score=8.0,
+        **fields,
+    )
+
+
+def test_scoring_takes_one_read_and_one_transaction(
+    run_in_rollback, statements
+) -> None:
+    async def score(db):
+        db.add_all(
+            [
+                models.Assignment(
+                    title="test-week99-readings",
+                    week_number=99,
+                    assignment_type="readings",
+                    max_score=10.0,
+                    due_date=DUE,
+                ),
+                models.Notebook(
+                    title="test-week99-notebook",
+                    week_number=99,
+                    assignment_type="readings",
+                    max_score=10.0,
+                    due_date=DUE,
+                ),
+            ]
+        )
+        await db.commit()
+        reference_cache.invalidate()
+        await reference_cache.get_reference_data(db)  # Warm, as between requests
+
+        commits: list[None] = []
+        event.listen(db.sync_session, "after_commit", lambda _: commits.append(None))
+        statements.clear()
+
+        context = await crud_student.get_submission_context(
+            db=db,
+            student_email="test-scoring@drexel.edu",
+            assignment="test-week99-readings",
+            week_number=99,
+            assignment_type="readings",
+            notebook_title="test-week99-notebook",
+        )
+        reads = [statement for statement, _ in statements]
+        statements.clear()
+
+        await crud_student.add_assignment_and_notebook_submissions(
+            db=db,
+            assignment_submission=submission(
+                schemas.AssignmentSubmission, assignment="test-week99-readings"
+            ),
+            notebook_submission=submission(
+                schemas.NotebookSubmission, notebook="test-week99-notebook"
+            ),
+        )
+        writes = [statement for statement, _ in statements]
+
+        best = await crud_student.get_best_score(
+            db, "test-scoring@drexel.edu", "test-week99-readings"
+        )
+        return context, reads, writes, len(commits), best
+
+    context, reads, writes, commits, best = run_in_rollback(score)
+
+    assert context == schemas.SubmissionContext(
+        already_completed=False,
+        assignment_max_score=10.0,
+        assignment_due_date=DUE,
+        notebook_max_score=10.0,
+        current_best=None,
+    )
+
+    # One read, then the two submissions and the best score, in one transaction
+    assert len(reads) == 1 and reads[0].lstrip().startswith("SELECT")
+    assert [statement.split()[0] for statement in writes] == ["INSERT"] * 3
+    assert commits == 1
+
+    assert best is not None and best.current_max_score == 8.0
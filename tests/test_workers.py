@@ -0,0 +1,55 @@
+"""
+Tests for the CPU worker pool's queue accounting.
+"""
+
+import asyncio
+import threading
+
+from app import workers
+
+
+def test_cancelled_jobs_leave_the_queue() -> None:
+    release = threading.Event()
+    ran: list[int] = []
+
+    async def scenario() -> None:
+        # Occupy every worker, so that the next job has to wait
+        blockers = [
+            asyncio.create_task(workers.run_cpu(release.wait))
+            for _ in range(workers.CPU_WORKERS)
+        ]
+        while workers.get_stats().running < workers.CPU_WORKERS:
+            await asyncio.sleep(0.01)
+
+        waiting = asyncio.create_task(workers.run_cpu(ran.append, 1))
+        await asyncio.sleep(0.05)
+        assert workers.get_stats().queued == 1
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+
+        release.set()
+        await asyncio.gather(*blockers)
+
+    before = workers.get_stats()
+    asyncio.run(scenario())
+    after = workers.get_stats()
+
+    assert after.queued == 0
+    assert after.running == 0
+    assert after.cancelled == before.cancelled + 1
+    assert after.completed == before.completed + workers.CPU_WORKERS
+    assert ran == []  # The cancelled job never ran
+
+
+def test_finished_jobs_leave_the_queue() -> None:
+    async def scenario() -> list[int]:
+        return await asyncio.gather(
+            *(workers.run_cpu(pow, n, 2) for n in range(workers.CPU_QUEUE_LIMIT))
+        )
+
+    assert asyncio.run(scenario()) == [n**2 for n in range(workers.CPU_QUEUE_LIMIT)]
+
+    stats = workers.get_stats()
+    assert stats.queued == 0
+    assert stats.running == 0